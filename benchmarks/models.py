@@ -0,0 +1,56 @@
+"""Synthetic Pydantic models used by the benchmarks."""
+
+from datetime import date
+from typing import Annotated, Any
+
+from pydantic import BaseModel, Field, create_model
+
+_FIELD_TYPES: list[tuple[Any, Any]] = [
+    (Annotated[str, Field(max_length=100)], ""),
+    (Annotated[int, Field(ge=0, le=100)], 0),
+    (float, 0.0),
+    (bool, False),
+    (date, ...),
+]
+
+
+def flat_model(n_fields: int) -> type[BaseModel]:
+    return create_model(
+        f"Flat{n_fields}",
+        **{f"field_{i}": _FIELD_TYPES[i % len(_FIELD_TYPES)] for i in range(n_fields)},
+    )
+
+
+def mixed_model(n_fields: int) -> type[BaseModel]:
+    nested = create_model("Nested", street=(str, ...), city=(str, ...))
+    types = [*_FIELD_TYPES, (list[str], ...), (dict[str, int], ...), (nested, ...)]
+
+    return create_model(
+        f"Mixed{n_fields}",
+        **{f"field_{i}": types[i % len(types)] for i in range(n_fields)},
+    )
+
+
+def nested_model(depth: int, width: int = 5) -> type[BaseModel]:
+    model = flat_model(width)
+
+    for level in range(depth):
+        model = create_model(
+            f"Level{level}",
+            **{f"field_{i}": _FIELD_TYPES[i % len(_FIELD_TYPES)] for i in range(width)},
+            child=(model, ...),
+        )
+
+    return model
+
+
+def array_instance(length: int) -> BaseModel:
+    model = create_model(f"Array{length}", items=(list[str], ...))
+
+    return model(items=[f"item {i}" for i in range(length)])
+
+
+def dict_instance(size: int) -> BaseModel:
+    model = create_model(f"Dict{size}", records=(dict[str, int], ...))
+
+    return model(records={f"key {i}": i for i in range(size)})
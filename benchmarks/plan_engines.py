@@ -0,0 +1,42 @@
+"""Compares plan build time of the JSON schema engine and the model introspection engine.
+
+Run from the repository root:
+
+    python -m benchmarks.plan_engines --fields 10 100 300 1000
+"""
+
+import argparse
+import timeit
+
+from benchmarks.models import mixed_model
+from src.plan import PlanEngine, build_plan
+
+ENGINES: tuple[PlanEngine, ...] = ("json_schema", "model")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fields", type=int, nargs="+", default=[10, 100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'fields':>8} {'json_schema ms':>16} {'model ms':>10} {'speedup':>8}")
+
+    for n_fields in args.fields:
+        model = mixed_model(n_fields)
+        timings = {
+            engine: min(
+                timeit.repeat(lambda: build_plan(model, engine), number=1, repeat=args.repeat)
+            )
+            * 1000
+            for engine in ENGINES
+        }
+
+        print(
+            f"{n_fields:>8} {timings['json_schema']:>16.2f} {timings['model']:>10.2f}"
+            f" {timings['json_schema'] / timings['model']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
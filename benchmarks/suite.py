@@ -0,0 +1,177 @@
+"""Measures rerun latency, widget count, peak memory and session state size of generated forms, and
+the import time of the package.
+
+Forms are rendered with the headless backend, so no Streamlit server is needed.
+Run from the repository root:
+
+    python -m benchmarks.suite --output bench_results.json
+    python -m benchmarks.suite --output new.json --compare bench_results.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from pydantic import BaseModel
+
+from benchmarks.models import array_instance, dict_instance, flat_model, nested_model
+from src import generate_form
+from src.backends import HeadlessBackend
+from src.plan import PlanEngine, invalidate_plans
+from src.state import state_size
+
+METRICS = ("first_render_ms", "rerun_ms", "widgets", "peak_memory_kb", "session_kb", "import_ms")
+
+IMPORTS = {
+    "import_plan": "src.plan",
+    "import_form": "src.generator",
+    "import_importer": "src.importer",
+    "import_streamlit": "streamlit",
+}
+
+_IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "streamlit" in sys.modules, "pandas" in sys.modules)
+"""
+
+
+def measure(model: BaseModel | type[BaseModel], engine: PlanEngine, reruns: int) -> dict[str, Any]:
+    invalidate_plans()
+    backend = HeadlessBackend()
+    form = lambda: generate_form(model, engine=engine)
+
+    start = time.perf_counter()
+    backend.run(form)
+    first_render = time.perf_counter() - start
+
+    timings = []
+
+    for _ in range(reruns):
+        start = time.perf_counter()
+        backend.run(form)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    backend.run(form)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "first_render_ms": round(first_render * 1000, 3),
+        "rerun_ms": round(statistics.median(timings) * 1000, 3),
+        "widgets": backend.widget_count,
+        "peak_memory_kb": round(peak / 1024, 1),
+        "session_kb": round(state_size(dict(backend.session_state)) / 1024, 1),
+    }
+
+
+def measure_import(module: str, repeat: int) -> dict[str, Any]:
+    timings = []
+
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SCRIPT.format(module=module)],
+            cwd=Path(__file__).parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        timings.append(float(out[0]))
+
+    return {
+        "import_ms": round(min(timings) * 1000, 3),
+        "loads_streamlit": out[1] == "True",
+        "loads_pandas": out[2] == "True",
+    }
+
+
+def cases(args: argparse.Namespace) -> dict[str, Callable[[], BaseModel | type[BaseModel]]]:
+    return {
+        **{f"fields_{n}": lambda n=n: flat_model(n) for n in args.fields},
+        **{f"depth_{n}": lambda n=n: nested_model(n) for n in args.depths},
+        **{f"array_{n}": lambda n=n: array_instance(n) for n in args.array_lengths},
+        **{f"dict_{n}": lambda n=n: dict_instance(n) for n in args.dict_sizes},
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> bool:
+    regressed = False
+
+    print(f"{'case':<16} {'metric':<16} {'baseline':>12} {'current':>12} {'change':>8}")
+
+    for case, metrics in results["results"].items():
+        if case not in baseline["results"]:
+            continue
+
+        for metric in METRICS:
+            if metric not in metrics or metric not in baseline["results"][case]:
+                continue
+
+            old, new = baseline["results"][case][metric], metrics[metric]
+            change = (new - old) / old if old else 0.0
+            flag = ""
+
+            if change > threshold:
+                flag = " !"
+                regressed = True
+
+            print(f"{case:<16} {metric:<16} {old:>12} {new:>12} {change:>+7.0%}{flag}")
+
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument("--fields", type=int, nargs="*", default=[10, 100, 1000, 5000])
+    parser.add_argument("--depths", type=int, nargs="*", default=[1, 5, 10, 20])
+    parser.add_argument("--array-lengths", type=int, nargs="*", default=[10, 100, 1000])
+    parser.add_argument("--dict-sizes", type=int, nargs="*", default=[10, 100, 1000])
+    parser.add_argument("--engine", choices=["json_schema", "model"], default="json_schema")
+    parser.add_argument("--reruns", type=int, default=5)
+    parser.add_argument("--import-repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="results file of a previous run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative regression")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "engine": args.engine,
+            "reruns": args.reruns,
+        },
+        "results": {},
+    }
+
+    for name, factory in cases(args).items():
+        results["results"][name] = measure(factory(), args.engine, args.reruns)
+        print(name, results["results"][name])
+
+    for name, module in IMPORTS.items():
+        results["results"][name] = measure_import(module, args.import_repeat)
+        print(name, results["results"][name])
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,48 @@
-from src.generator import generate_form
+from typing import TYPE_CHECKING, Any
+from importlib import import_module
+
+if TYPE_CHECKING:
+    from src.generator import generate_form
+    from src.batch import generate_batch_form
+    from src.importer import generate_import, import_records
+    from src.plan import get_plan, invalidate_plans, plan_cache
+    from src.namespace import clear_form_state, form_state_keys, form_state_size
+    from src.patch import form_patch
+    from src.profiling import RenderProfiler, session_profiler
+    from src.state import session_memory
+    from src.drafts import FileDraftStore, SQLiteDraftStore, export_draft, load_draft, restore_draft, save_draft
+
+_EXPORTS = {
+    "generate_form": "src.generator",
+    "generate_batch_form": "src.batch",
+    "generate_import": "src.importer",
+    "import_records": "src.importer",
+    "get_plan": "src.plan",
+    "invalidate_plans": "src.plan",
+    "plan_cache": "src.plan",
+    "clear_form_state": "src.namespace",
+    "form_state_keys": "src.namespace",
+    "form_state_size": "src.namespace",
+    "form_patch": "src.patch",
+    "RenderProfiler": "src.profiling",
+    "session_profiler": "src.profiling",
+    "session_memory": "src.state",
+    "FileDraftStore": "src.drafts",
+    "SQLiteDraftStore": "src.drafts",
+    "export_draft": "src.drafts",
+    "load_draft": "src.drafts",
+    "restore_draft": "src.drafts",
+    "save_draft": "src.drafts",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+
+    return value
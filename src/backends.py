@@ -0,0 +1,451 @@
+from typing import Any, Callable, Iterator, Literal, Protocol
+from contextlib import AbstractContextManager, contextmanager
+from inspect import signature
+from contextvars import ContextVar
+
+from pydantic import BaseModel
+
+from src.utils import container_styles, nested_container
+
+RerunScope = Literal["app", "fragment"]
+
+
+WIDGETS = frozenset(
+    {
+        "checkbox",
+        "toggle",
+        "radio",
+        "number_input",
+        "slider",
+        "text_input",
+        "selectbox",
+        "color_picker",
+        "date_input",
+        "time_input",
+        "data_editor",
+        "file_uploader",
+        "button",
+        "form_submit_button",
+    }
+)
+
+
+class WidgetBackend(Protocol):
+    session_state: Any
+    column_config: Any
+    sidebar: AbstractContextManager[Any]
+
+    def header(self, body: str) -> Any: ...
+
+    def text(self, body: str) -> Any: ...
+
+    def markdown(self, body: str, **kwargs: Any) -> Any: ...
+
+    def error(self, body: str) -> Any: ...
+
+    def checkbox(self, label: str, value: bool = False, **kwargs: Any) -> bool: ...
+
+    def toggle(self, label: str, value: bool = False, **kwargs: Any) -> bool: ...
+
+    def radio(self, label: str, options: Any, index: int = 0, **kwargs: Any) -> Any: ...
+
+    def number_input(self, label: str, value: Any = None, **kwargs: Any) -> Any: ...
+
+    def slider(self, label: str, value: Any = None, **kwargs: Any) -> Any: ...
+
+    def text_input(self, label: str, value: str | None = None, **kwargs: Any) -> str | None: ...
+
+    def selectbox(self, label: str, options: Any, index: int = 0, **kwargs: Any) -> Any: ...
+
+    def color_picker(self, label: str, value: str | None = None, **kwargs: Any) -> str: ...
+
+    def date_input(self, label: str, value: Any = None, **kwargs: Any) -> Any: ...
+
+    def time_input(self, label: str, value: Any = None, **kwargs: Any) -> Any: ...
+
+    def data_editor(self, data: Any, **kwargs: Any) -> Any: ...
+
+    def dataframe(self, data: Any, **kwargs: Any) -> Any: ...
+
+    def file_uploader(self, label: str, **kwargs: Any) -> Any: ...
+
+    def progress(self, value: float, text: str | None = None) -> Any: ...
+
+    def spinner(self, text: str) -> Any: ...
+
+    def empty(self) -> Any: ...
+
+    def button(self, label: str, key: str | None = None, **kwargs: Any) -> bool: ...
+
+    def form_submit_button(self, label: str, **kwargs: Any) -> bool: ...
+
+    def form(self, key: str, **kwargs: Any) -> Any: ...
+
+    def columns(self, spec: int | tuple[int, ...]) -> list[Any]: ...
+
+    def container(self, key: str) -> Any: ...
+
+    def styles(self) -> None: ...
+
+    def fragment(self, func: Callable[..., Any]) -> Callable[..., Any]: ...
+
+    def rerun(self, scope: RerunScope = "app") -> None: ...
+
+
+class StreamlitBackend:
+    """Renders widgets with Streamlit."""
+
+    @property
+    def session_state(self) -> Any:
+        return _streamlit().session_state
+
+    def container(self, key: str) -> Any:
+        return nested_container(key=key)
+
+    def styles(self) -> None:
+        container_styles()
+
+    def fragment(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        st = _streamlit()
+        decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+        return decorator(func) if decorator is not None else func
+
+    def rerun(self, scope: RerunScope = "app") -> None:
+        st = _streamlit()
+
+        if scope == "fragment" and "scope" in signature(st.rerun).parameters:
+            st.rerun(scope="fragment")
+        else:
+            st.rerun()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_streamlit(), name)
+
+
+def _streamlit() -> Any:
+    import streamlit as st
+    import streamlit_nested_layout
+
+    return st
+
+
+class WidgetCall(BaseModel):
+    widget: str
+    label: str | None = None
+    key: str | None = None
+    kwargs: dict[str, Any] = {}
+
+
+class HeadlessRerun(Exception):
+    pass
+
+
+class _HeadlessColumnConfig:
+    def __getattr__(self, name: str) -> Callable[..., dict[str, Any]]:
+        return lambda label=None, **kwargs: {"type": name, "label": label, **kwargs}
+
+
+class _HeadlessBlock:
+    def __enter__(self) -> "_HeadlessBlock":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        return None
+
+
+class _HeadlessProgress:
+    def __init__(self, value: float, text: str | None = None) -> None:
+        self.value = value
+        self.text = text
+
+    def progress(self, value: float, text: str | None = None) -> None:
+        self.value = value
+        self.text = text
+
+
+class _HeadlessPlaceholder:
+    def __init__(self) -> None:
+        self.body: str | None = None
+
+    def text(self, body: str) -> None:
+        self.body = body
+
+    def empty(self) -> None:
+        self.body = None
+
+
+class HeadlessBackend:
+    """Records widget calls in memory and replays scripted values, no Streamlit server is needed."""
+
+    def __init__(self, values: dict[str, Any] | None = None, max_reruns: int = 10) -> None:
+        self.session_state: dict[str, Any] = dict(values or {})
+        self.max_reruns = max_reruns
+        self.calls: list[WidgetCall] = []
+        self.reruns = 0
+        self._clicks: set[str] = set()
+        self._callbacks: dict[str, tuple[Callable[..., Any], tuple, dict[str, Any]]] = {}
+        self._widget_keys: set[str] = set()
+        self._rendered: set[str] = set()
+        self.column_config = _HeadlessColumnConfig()
+        self.sidebar = _HeadlessBlock()
+
+    @property
+    def widget_count(self) -> int:
+        return len(self.calls)
+
+    def set_value(self, key: str, value: Any) -> None:
+        self.session_state[key] = value
+
+    def click(self, key: str) -> None:
+        self._clicks.add(key)
+
+    def run(self, script: Callable[[], Any]) -> Any:
+        self.reruns = 0
+
+        with use_backend(self):
+            for key in self._clicks & self._callbacks.keys():
+                on_click, args, kwargs = self._callbacks[key]
+                on_click(*args, **kwargs)
+
+            self._callbacks = {}
+
+            while True:
+                self.calls = []
+                rendered = set()
+                self._rendered = rendered
+
+                try:
+                    res = script()
+                except HeadlessRerun:
+                    if self.reruns >= self.max_reruns:
+                        raise RuntimeError(f"Script reran more than {self.max_reruns} times")
+
+                    self.reruns += 1
+                    self._widget_keys |= rendered
+                    continue
+                finally:
+                    self._clicks.clear()
+
+                for key in self._widget_keys - rendered:
+                    self.session_state.pop(key, None)
+
+                self._widget_keys = rendered
+
+                return res
+
+    def header(self, body: str) -> None:
+        self.calls.append(WidgetCall(widget="header", label=body))
+
+    def text(self, body: str) -> None:
+        self.calls.append(WidgetCall(widget="text", label=body))
+
+    def markdown(self, body: str, **kwargs: Any) -> None:
+        self.calls.append(WidgetCall(widget="markdown", label=body, kwargs=kwargs))
+
+    def error(self, body: str) -> None:
+        self.calls.append(WidgetCall(widget="error", label=body))
+
+    def checkbox(self, label: str, value: bool = False, key: str | None = None, **kwargs: Any) -> bool:
+        return self._widget("checkbox", label, key, value, kwargs)
+
+    def toggle(self, label: str, value: bool = False, key: str | None = None, **kwargs: Any) -> bool:
+        return self._widget("toggle", label, key, value, kwargs)
+
+    def radio(
+        self, label: str, options: Any, index: int = 0, key: str | None = None, **kwargs: Any
+    ) -> Any:
+        options = list(options)
+        value = options[index] if index is not None and len(options) > 0 else None
+
+        return self._widget("radio", label, key, value, {"options": options, **kwargs})
+
+    def number_input(self, label: str, value: Any = "min", key: str | None = None, **kwargs: Any) -> Any:
+        if value == "min":
+            value = kwargs.get("min_value") if kwargs.get("min_value") is not None else 0
+
+        return self._widget("number_input", label, key, value, kwargs)
+
+    def slider(self, label: str, value: Any = None, key: str | None = None, **kwargs: Any) -> Any:
+        return self._widget("slider", label, key, value, kwargs)
+
+    def text_input(
+        self, label: str, value: str | None = "", key: str | None = None, **kwargs: Any
+    ) -> str | None:
+        return self._widget("text_input", label, key, value, kwargs)
+
+    def selectbox(
+        self, label: str, options: Any, index: int = 0, key: str | None = None, **kwargs: Any
+    ) -> Any:
+        options = list(options)
+        value = options[index] if index is not None and len(options) > 0 else None
+
+        return self._widget("selectbox", label, key, value, {"options": options, **kwargs})
+
+    def color_picker(
+        self, label: str, value: str | None = None, key: str | None = None, **kwargs: Any
+    ) -> str:
+        return self._widget(
+            "color_picker", label, key, value if value is not None else "#000000", kwargs
+        )
+
+    def date_input(self, label: str, value: Any = None, key: str | None = None, **kwargs: Any) -> Any:
+        return self._widget("date_input", label, key, value, kwargs)
+
+    def time_input(self, label: str, value: Any = None, key: str | None = None, **kwargs: Any) -> Any:
+        return self._widget("time_input", label, key, value, kwargs)
+
+    def data_editor(self, data: Any, key: str | None = None, **kwargs: Any) -> Any:
+        return self._widget("data_editor", "data_editor", key, data, kwargs)
+
+    def dataframe(self, data: Any, **kwargs: Any) -> None:
+        self.calls.append(WidgetCall(widget="dataframe", kwargs=kwargs))
+
+    def file_uploader(self, label: str, key: str | None = None, **kwargs: Any) -> Any:
+        return self._widget("file_uploader", label, key, None, kwargs)
+
+    def progress(self, value: float, text: str | None = None) -> _HeadlessProgress:
+        self.calls.append(WidgetCall(widget="progress", label=text))
+
+        return _HeadlessProgress(value, text)
+
+    def spinner(self, text: str) -> _HeadlessBlock:
+        return _HeadlessBlock()
+
+    def empty(self) -> _HeadlessPlaceholder:
+        return _HeadlessPlaceholder()
+
+    def button(self, label: str, key: str | None = None, **kwargs: Any) -> bool:
+        key = key if key is not None else label
+        self.calls.append(WidgetCall(widget="button", label=label, key=key, kwargs=kwargs))
+
+        if kwargs.get("on_click") is not None:
+            self._callbacks[key] = (
+                kwargs["on_click"],
+                tuple(kwargs.get("args") or ()),
+                kwargs.get("kwargs") or {},
+            )
+
+        return key in self._clicks
+
+    def form_submit_button(self, label: str, **kwargs: Any) -> bool:
+        return self.button(label, **kwargs)
+
+    def form(self, key: str, **kwargs: Any) -> _HeadlessBlock:
+        return _HeadlessBlock()
+
+    def columns(self, spec: int | tuple[int, ...]) -> list[_HeadlessBlock]:
+        return [_HeadlessBlock() for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    def container(self, key: str) -> _HeadlessBlock:
+        return _HeadlessBlock()
+
+    def styles(self) -> None:
+        pass
+
+    def fragment(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        return func
+
+    def rerun(self, scope: RerunScope = "app") -> None:
+        raise HeadlessRerun()
+
+    def _widget(
+        self, widget: str, label: str, key: str | None, value: Any, kwargs: dict[str, Any]
+    ) -> Any:
+        key = key if key is not None else label
+        self.calls.append(WidgetCall(widget=widget, label=label, key=key, kwargs=kwargs))
+        self._rendered.add(key)
+
+        if key not in self.session_state:
+            self.session_state[key] = value
+
+        return self.session_state[key]
+
+
+class CountingBackend:
+    """Counts the widgets created through the wrapped backend and the deltas sent to the browser."""
+
+    def __init__(self, backend: WidgetBackend) -> None:
+        self.backend = backend
+        self.widget_count = 0
+        self.delta_count = 0
+        self.delta_bytes = 0
+
+    @contextmanager
+    def count_deltas(self) -> Iterator[None]:
+        if not isinstance(self.backend, StreamlitBackend):
+            yield
+            return
+
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+        ctx = get_script_run_ctx()
+
+        if ctx is None:
+            yield
+            return
+
+        enqueue = ctx._enqueue
+
+        def _counted(msg: Any) -> None:
+            if msg.HasField("delta"):
+                self.delta_count += 1
+                self.delta_bytes += msg.ByteSize()
+
+            enqueue(msg)
+
+        ctx._enqueue = _counted
+
+        try:
+            yield
+        finally:
+            ctx._enqueue = enqueue
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.backend, name)
+
+        if name not in WIDGETS:
+            return attr
+
+        def _counted(*args: Any, **kwargs: Any) -> Any:
+            self.widget_count += 1
+            return attr(*args, **kwargs)
+
+        return _counted
+
+
+_backend: ContextVar[WidgetBackend] = ContextVar("backend", default=StreamlitBackend())
+
+
+@contextmanager
+def use_backend(backend: WidgetBackend) -> Iterator[WidgetBackend]:
+    """Renders widgets created inside the block with the given backend.
+
+    :param backend: Widget backend
+    :type backend: WidgetBackend
+    """
+
+    token = _backend.set(backend)
+
+    try:
+        yield backend
+    finally:
+        _backend.reset(token)
+
+
+def current_backend() -> WidgetBackend:
+    """Returns the backend widgets are currently rendered with.
+
+    :return: Widget backend
+    :rtype: WidgetBackend
+    """
+
+    return _backend.get()
+
+
+class _BackendProxy:
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_backend.get(), name)
+
+
+ui = _BackendProxy()
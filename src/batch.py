@@ -0,0 +1,154 @@
+from typing import Any
+from functools import lru_cache
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from src.backends import ui
+from src.inputs import _column_config, _from_cell, _to_cell
+from src.namespace import register_form
+from src.plan import FieldPlan, PlanEngine, get_plan
+from src.schemas import ItemType
+
+
+@lru_cache(maxsize=128)
+def batch_adapter(model_class: type[BaseModel]) -> TypeAdapter:
+    """Returns the cached adapter validating a list of model instances in one call.
+
+    :param model_class: Pydantic model class
+    :type model_class: type[BaseModel]
+    :return: Type adapter of list[model_class]
+    :rtype: TypeAdapter
+    """
+
+    return TypeAdapter(list[model_class])
+
+
+def generate_batch_form(
+    model: type[BaseModel],
+    rows: list[BaseModel] | None = None,
+    form_label: str | None = None,
+    submit_btn_label: str = "Submit",
+    show_form_label: bool = True,
+    engine: PlanEngine = "json_schema",
+) -> list[BaseModel] | None:
+    """Generates a data editor with one row per model instance, if it is submitted the whole batch
+    is validated at once and the list of instances is returned.
+
+    :param model: Pydantic model class
+    :type model: type[BaseModel]
+    :param rows: Initial model instances, defaults to None
+    :type rows: list[BaseModel] | None, optional
+    :param form_label: Form label, defaults to None
+    :type form_label: str | None, optional
+    :param submit_btn_label: Submit button label, defaults to "Submit"
+    :type submit_btn_label: str, optional
+    :param show_form_label: If True, show form label, defaults to True
+    :type show_form_label: bool, optional
+    :param engine: Schema source, "json_schema" or "model" (reads model fields directly), defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :return: List of Pydantic model instances
+    :rtype: list[BaseModel] | None
+    """
+
+    import pandas as pd
+
+    plan = get_plan(model, engine)
+    register_form(plan.form_key)
+    columns = _batch_columns(plan.fields)
+    errors_key = f"{plan.form_key}__batch_errors"
+
+    if show_form_label:
+        ui.header(form_label if form_label is not None else plan.title)
+
+    dumps = [r.model_dump(by_alias=True) for r in rows or []]
+    data = pd.DataFrame(
+        [{c: _to_cell(item, _get(d, path)) for c, (path, item) in columns.items()} for d in dumps],
+        columns=list(columns),
+    )
+
+    edited = ui.data_editor(
+        data,
+        key=f"{plan.form_key}__batch",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={c: _column_config(c, item) for c, (_, item) in columns.items()},
+    )
+
+    for msg in ui.session_state.get(errors_key, []):
+        ui.error(msg)
+
+    if ui.button(submit_btn_label, key=f"{plan.form_key}__batch_submit"):
+        positions, records = [], []
+
+        for position, r in enumerate(edited.to_dict("records")):
+            cells = {c: _from_cell(item, r.get(c)) for c, (_, item) in columns.items()}
+
+            if any(v is not None for v in cells.values()):
+                positions.append(position)
+                records.append(_record(columns, cells))
+
+        try:
+            res = batch_adapter(model).validate_python(records)
+            ui.session_state[errors_key] = []
+            return res
+
+        except ValidationError as errs:
+            ui.session_state[errors_key] = [
+                f"Row {positions[e['loc'][0]] + 1}, {'.'.join(map(str, e['loc'][1:]))}: {e['msg']}"
+                if len(e["loc"]) > 1
+                else f"Row {positions[e['loc'][0]] + 1}: {e['msg']}"
+                for e in errs.errors()
+            ]
+            ui.rerun()
+
+    return None
+
+
+def _batch_columns(fields: list[FieldPlan]) -> dict[str, tuple[tuple[str, ...], ItemType]]:
+    columns = {}
+
+    for f in fields:
+        p = f.property
+
+        if f.kind == "union" and len(f.variants) == 1:
+            p = next(iter(f.variants.values())).property
+
+        if p is not None and p.type not in ("array", "object"):
+            columns[".".join(f.path)] = (
+                f.path,
+                ItemType(type=p.type, enum=p.enum, format=p.format),
+            )
+        elif f.kind == "nested":
+            columns.update(_batch_columns(f.fields))
+
+    return columns
+
+
+def _get(values: dict[str, Any], path: tuple[str, ...]) -> Any:
+    for part in path:
+        if not isinstance(values, dict):
+            return None
+
+        values = values.get(part)
+
+    return values
+
+
+def _record(
+    columns: dict[str, tuple[tuple[str, ...], ItemType]], cells: dict[str, Any]
+) -> dict[str, Any]:
+    record = {}
+
+    for c, (path, _) in columns.items():
+        if cells[c] is None:
+            continue
+
+        node = record
+
+        for part in path[:-1]:
+            node = node.setdefault(part, {})
+
+        node[path[-1]] = cells[c]
+
+    return record
@@ -0,0 +1,262 @@
+from typing import Any, Protocol
+from contextlib import closing
+from datetime import datetime, date, time
+from pathlib import Path
+import sqlite3
+
+from pydantic import BaseModel
+from pydantic_core import to_json
+from pydantic_extra_types.color import Color
+
+from src.backends import ui
+from src.introspect import model_reference
+from src.namespace import clear_form_state, register_form
+from src.plan import FieldPlan, PlanEngine, expand_field, get_plan
+from src.schemas import ItemType, Property
+
+DRAFT_VERSION = 1
+
+
+class Draft(BaseModel):
+    version: int = DRAFT_VERSION
+    model: str
+    values: dict[str, Any]
+
+
+class DraftStore(Protocol):
+    def save(self, draft_id: str, data: bytes) -> None: ...
+
+    def load(self, draft_id: str) -> bytes | None: ...
+
+    def delete(self, draft_id: str) -> None: ...
+
+
+class FileDraftStore:
+    """Stores each draft as a JSON file in the directory."""
+
+    def __init__(self, directory: str | Path) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def save(self, draft_id: str, data: bytes) -> None:
+        self._path(draft_id).write_bytes(data)
+
+    def load(self, draft_id: str) -> bytes | None:
+        path = self._path(draft_id)
+
+        return path.read_bytes() if path.exists() else None
+
+    def delete(self, draft_id: str) -> None:
+        self._path(draft_id).unlink(missing_ok=True)
+
+    def _path(self, draft_id: str) -> Path:
+        if Path(draft_id).name != draft_id or draft_id in ("", ".", ".."):
+            raise ValueError(f"Invalid draft id: {draft_id!r}")
+
+        return self.directory / f"{draft_id}.json"
+
+
+class SQLiteDraftStore:
+    """Stores drafts in a table of the SQLite database."""
+
+    def __init__(self, path: str | Path, table: str = "drafts") -> None:
+        self.path = str(path)
+        self.table = table
+
+        with closing(sqlite3.connect(self.path)) as con, con:
+            con.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (id TEXT PRIMARY KEY, data BLOB NOT NULL)"
+            )
+
+    def save(self, draft_id: str, data: bytes) -> None:
+        with closing(sqlite3.connect(self.path)) as con, con:
+            con.execute(
+                f"INSERT OR REPLACE INTO {self.table} (id, data) VALUES (?, ?)", (draft_id, data)
+            )
+
+    def load(self, draft_id: str) -> bytes | None:
+        with closing(sqlite3.connect(self.path)) as con:
+            row = con.execute(
+                f"SELECT data FROM {self.table} WHERE id = ?", (draft_id,)
+            ).fetchone()
+
+        return row[0] if row is not None else None
+
+    def delete(self, draft_id: str) -> None:
+        with closing(sqlite3.connect(self.path)) as con, con:
+            con.execute(f"DELETE FROM {self.table} WHERE id = ?", (draft_id,))
+
+
+def export_draft(model_class: type[BaseModel], engine: PlanEngine = "json_schema") -> bytes:
+    """Exports the current, not validated, values of the form as a compact JSON snapshot.
+
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :return: JSON snapshot
+    :rtype: bytes
+    """
+
+    plan = get_plan(model_class, engine)
+    draft = Draft(
+        model=model_reference(model_class),
+        values=ui.session_state.get(f"{plan.form_key}__draft", {}),
+    )
+
+    return to_json(draft.model_dump(), fallback=str)
+
+
+def restore_draft(
+    model_class: type[BaseModel], data: bytes | str, engine: PlanEngine = "json_schema"
+) -> None:
+    """Restores the form from a snapshot, the values are not validated. The form state is reset,
+    so it should be called before the form is rendered.
+
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param data: JSON snapshot
+    :type data: bytes | str
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :raises ValueError: If the snapshot has another version or belongs to another model
+    """
+
+    draft = Draft.model_validate_json(data)
+
+    if draft.version != DRAFT_VERSION:
+        raise ValueError(f"Unsupported draft version: {draft.version}")
+    if draft.model != model_reference(model_class):
+        raise ValueError(f"Draft of {draft.model} cannot be restored to {model_reference(model_class)}")
+
+    plan = get_plan(model_class, engine)
+    clear_form_state(model_class, engine)
+    register_form(plan.form_key)
+
+    ui.session_state[f"{plan.form_key}__restore"] = _decode(plan.fields, draft.values)
+
+
+def save_draft(
+    store: DraftStore,
+    draft_id: str,
+    model_class: type[BaseModel],
+    engine: PlanEngine = "json_schema",
+) -> None:
+    """Saves the current values of the form to the store.
+
+    :param store: Draft store
+    :type store: DraftStore
+    :param draft_id: Draft identifier
+    :type draft_id: str
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    """
+
+    store.save(draft_id, export_draft(model_class, engine))
+
+
+def load_draft(
+    store: DraftStore,
+    draft_id: str,
+    model_class: type[BaseModel],
+    engine: PlanEngine = "json_schema",
+) -> bool:
+    """Restores the form from the draft in the store.
+
+    :param store: Draft store
+    :type store: DraftStore
+    :param draft_id: Draft identifier
+    :type draft_id: str
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :return: True if the draft was found
+    :rtype: bool
+    """
+
+    data = store.load(draft_id)
+
+    if data is None:
+        return False
+
+    restore_draft(model_class, data, engine)
+
+    return True
+
+
+def _decode(fields: list[FieldPlan], values: dict[str, Any] | None) -> dict[str, Any] | None:
+    if values is None:
+        return None
+
+    res = dict(values)
+
+    for f in fields:
+        if res.get(f.name) is None:
+            continue
+
+        if f.kind == "input":
+            res[f.name] = _decode_property(f.property, res[f.name])
+        elif f.kind in ("nested", "recursive"):
+            res[f.name] = _decode(expand_field(f), res[f.name])
+        elif f.kind == "union":
+            res[f.name] = _decode_union(f, res[f.name])
+
+    return res
+
+
+def _decode_union(f: FieldPlan, value: Any) -> Any:
+    if isinstance(value, dict):
+        if f.discriminator is not None:
+            variant = f.variants.get(str(value.get(f.discriminator)))
+
+            if variant is not None:
+                return {**value, **_decode(expand_field(variant), value)}
+
+        for v in f.variants.values():
+            if v.kind != "input" and set(value) <= {g.name for g in expand_field(v)}:
+                return {**value, **_decode(expand_field(v), value)}
+
+    inputs = [v.property for v in f.variants.values() if v.kind == "input"]
+
+    if isinstance(value, str) and any(p.type == "string" and p.format is None for p in inputs):
+        return value
+
+    for p in inputs:
+        try:
+            decoded = _decode_property(p, value)
+        except ValueError:
+            continue
+
+        if decoded is not value:
+            return decoded
+
+    return value
+
+
+def _decode_property(p: Property, value: Any) -> Any:
+    if p.type == "array" and p.items is not None and isinstance(value, list):
+        return [_decode_item(p.items, v) for v in value]
+    if p.type == "object" and p.additionalProperties is not None and isinstance(value, dict):
+        return {k: _decode_item(p.additionalProperties, v) for k, v in value.items()}
+
+    return _decode_item(p, value)
+
+
+def _decode_item(item: ItemType | Property, value: Any) -> Any:
+    if value is None or not isinstance(value, str):
+        return value
+
+    match item.format:
+        case "date":
+            return date.fromisoformat(value)
+        case "time":
+            return time.fromisoformat(value)
+        case "date-time":
+            return datetime.fromisoformat(value)
+        case "color":
+            return Color(value)
+
+    return value
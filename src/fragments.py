@@ -0,0 +1,33 @@
+from typing import Any, Callable
+
+from src.backends import ui
+from src.options import get_options, use_options
+
+
+def render_fragment(key: str, func: Callable[..., Any], *args: Any) -> Any:
+    """Renders the subtree as an independent fragment, so its interactions rerun only the subtree.
+
+    The result is kept in session state, a fragment rerun does not return it to the parent.
+
+    :param key: Key of the subtree
+    :type key: str
+    :param func: Function rendering the subtree
+    :type func: Callable[..., Any]
+    :return: Value returned by the function on its last run
+    :rtype: Any
+    """
+
+    options = get_options()
+
+    if not options.fragments or options.batched:
+        return func(*args)
+
+    result_key = f"{key}__result"
+
+    def _fragment(*args: Any) -> None:
+        with use_options(options):
+            ui.session_state[result_key] = func(*args)
+
+    ui.fragment(_fragment)(*args)
+
+    return ui.session_state.get(result_key)
@@ -1,12 +1,20 @@
-from typing import Any
+from typing import Any, Iterator, Literal
+from concurrent.futures import Executor
+from contextlib import contextmanager, nullcontext
 
 from pydantic import BaseModel, ValidationError
-import streamlit as st
-import streamlit_nested_layout
 
-from src.schemas import Schema, InputError, Property, NestedProperty
-from src.utils import label_to_key, key_to_label, nested_container
-from src.inputs import get_input
+from src.schemas import InputError
+from src.backends import CountingBackend, current_backend, ui, use_backend
+from src.fragments import render_fragment
+from src.namespace import collect_orphans, register_form
+from src.patch import diff_values
+from src.plan import FieldKind, FieldPlan, PlanEngine, expand_field, get_plan
+from src.options import RenderOptions, use_options
+from src.profiling import FormObserver, span
+from src.validation import ValidationTimeout, run_validation, validate_model, validate_update
+
+NestedLayout = Literal["inline", "expander", "tabs"]
 
 
 def generate_form(
@@ -14,6 +22,19 @@ def generate_form(
     form_label: str | None = None,
     submit_btn_label: str = "Submit",
     show_form_label: bool = True,
+    engine: PlanEngine = "json_schema",
+    nested_layout: NestedLayout = "inline",
+    array_page_size: int | None = None,
+    tabular: bool = False,
+    batched: bool = False,
+    fragments: bool = False,
+    observer: FormObserver | None = None,
+    executor: Executor | None = None,
+    validation_timeout: float | None = None,
+    choice_page_size: int | None = None,
+    compact: bool = False,
+    diff: bool = False,
+    reorderable: bool = False,
 ) -> BaseModel | None:
     """Generates a form according to the Pydantic model, if the form is submitted it returns an instance of the model.
 
@@ -25,99 +46,442 @@ def generate_form(
     :type submit_btn_label: str, optional
     :param show_form_label: If True, show form label, defaults to True
     :type show_form_label: bool, optional
+    :param engine: Schema source, "json_schema" or "model" (reads model fields directly), defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :param nested_layout: Layout of nested models, "inline", "expander" or "tabs", collapsed and
+        inactive sections create no widgets, defaults to "inline"
+    :type nested_layout: NestedLayout, optional
+    :param array_page_size: If set, lists are rendered in pages of this many items, defaults to None
+    :type array_page_size: int | None, optional
+    :param tabular: If True, lists and dicts are edited in a single data editor, defaults to False
+    :type tabular: bool, optional
+    :param batched: If True, the form is wrapped in st.form and only its buttons rerun the script, defaults to False
+    :type batched: bool, optional
+    :param fragments: If True, nested models, lists and dicts are rendered as fragments, so their
+        interactions rerun only the fragment (requires st.fragment), defaults to False
+    :type fragments: bool, optional
+    :param observer: Receives timing and widget count spans of the plan build, fields, nested
+        models and validation, defaults to None
+    :type observer: FormObserver | None, optional
+    :param executor: If set, the submitted values are validated in this thread or process pool
+        while a spinner is shown, defaults to None
+    :type executor: Executor | None, optional
+    :param validation_timeout: Seconds to wait for the validation in the executor, defaults to None
+    :type validation_timeout: float | None, optional
+    :param choice_page_size: If set, enums with more options are searchable and show this many
+        options at a time, defaults to None
+    :type choice_page_size: int | None, optional
+    :param compact: If True, the cheapest layout with the fewest widgets is used for each type, help
+        texts are only sent when the "Show help" toggle is on, defaults to False
+    :type compact: bool, optional
+    :param diff: If True and model is an instance, the changed fields are applied to the instance
+        and an updated copy is returned, the changes are available through form_patch,
+        defaults to False
+    :type diff: bool, optional
+    :param reorderable: If True, list items get buttons to move them up and to duplicate them,
+        defaults to False
+    :type reorderable: bool, optional
     :return: Pydantic model instance
     :rtype: BaseModel | None
     """
 
-    schema = Schema(**model.model_json_schema(ref_template="{model}"))
-    prop_keys = []
+    options = RenderOptions(
+        array_page_size=array_page_size,
+        tabular=tabular,
+        batched=batched,
+        fragments=fragments,
+        observer=observer,
+        choice_page_size=choice_page_size,
+        compact=compact,
+        reorderable=reorderable,
+    )
 
-    form_key = label_to_key(schema.title)
-    form_input_errors_key = f"{form_key}_input_errors"
+    with use_options(options), _counting(observer), span("form"):
+        if isinstance(model, BaseModel):
+            values = model.model_dump(by_alias=True)
+            model_class = model.__class__
+        else:
+            values = {}
+            model_class = model
 
-    if isinstance(model, BaseModel):
-        values = model.model_dump()
-        model_class = model.__class__
-    else:
-        values = {}
-        model_class = model
+        original = values
 
-    if show_form_label:
-        st.header(form_label if form_label is not None else schema.title)
+        with span("plan"):
+            plan = get_plan(model_class, engine)
 
-    with nested_container(key=f"nested_form"):
-        c1 = st.columns(1)
-        with c1[0]:
-            values = _generate_input(
-                schema,
-                label_to_key(schema.title),
-                values,
-                st.session_state.get(form_input_errors_key, {}),
-                prop_keys,
-            )
+        form_key = plan.form_key
+        register_form(form_key)
+        form_input_errors_key = f"{form_key}__errors"
+        values = _restored_values(form_key, values)
+
+        if show_form_label:
+            ui.header(form_label if form_label is not None else plan.title)
+
+        ui.styles()
+
+        if compact:
+            options.show_help = ui.toggle("Show help", key=f"{form_key}__help")
+
+        with ui.container(key=f"{form_key}_con"), _form_block(form_key, batched):
+            c1 = ui.columns(1)
+            with c1[0]:
+                values = _generate_input(
+                    plan.fields,
+                    form_key,
+                    values,
+                    ui.session_state.get(form_input_errors_key, {}),
+                    nested_layout,
+                )
+                ui.session_state[f"{form_key}__draft"] = values
+                collect_orphans(plan)
+
+                if batched:
+                    c2, c3 = ui.columns((1, 1))
+                    with c3:
+                        ui.form_submit_button("Apply changes")
+                    with c2:
+                        submitted = ui.form_submit_button(submit_btn_label)
+                else:
+                    submitted = ui.button(submit_btn_label)
+
+                if submitted:
+                    instance = model if diff and isinstance(model, BaseModel) else None
+
+                    if instance is not None:
+                        patch = diff_values(plan.fields, original, values)
+                        ui.session_state[f"{form_key}__patch"] = patch
+                        values = {name: values[name] for name in patch}
+
+                    try:
+                        with span("validation"):
+                            if executor is not None:
+                                res = run_validation(
+                                    executor,
+                                    model_class,
+                                    values,
+                                    f"{form_key}__validation",
+                                    validation_timeout,
+                                    instance=instance,
+                                )
+                            elif instance is not None:
+                                res = validate_update(instance, values)
+                            else:
+                                res = validate_model(model_class, values)
+
+                        ui.session_state[form_input_errors_key] = {}
+                        return res
+
+                    except ValidationError as errs:
+                        errors_values = _error_tree(errs.errors(), plan.paths)
+
+                        ui.session_state[form_input_errors_key] = errors_values
+                        ui.rerun()
+
+                    except ValidationTimeout as e:
+                        ui.session_state[form_input_errors_key] = {None: InputError(msg=str(e))}
+                        ui.rerun()
+
+                return None
+
+
+def _restored_values(form_key: str, values: dict[str, Any]) -> dict[str, Any]:
+    restored_key = f"{form_key}__restored"
+    restore = ui.session_state.pop(f"{form_key}__restore", None)
+
+    if restore is not None:
+        ui.session_state[restored_key] = (values, restore)
+
+    restored = ui.session_state.get(restored_key)
+
+    if restored is None:
+        return values
+    if restored[0] != values:
+        del ui.session_state[restored_key]
+        return values
+
+    return restored[1]
 
-            if st.button(submit_btn_label):
-                try:
-                    res = model_class(**values)
-                    st.session_state[form_input_errors_key] = {}
-                    return res
 
-                except ValidationError as errs:
-                    errors_values = {}
+@contextmanager
+def _counting(observer: FormObserver | None) -> Iterator[None]:
+    if observer is None:
+        yield
+        return
 
-                    for e in errs.errors():
-                        for p in e["loc"][::-1]:
-                            if p in prop_keys:
-                                last_pos = p
-                                break
+    backend = CountingBackend(current_backend())
 
-                        temp = errors_values
-                        for l in e["loc"]:
-                            if l not in temp:
-                                if l == last_pos:
-                                    temp[l] = InputError(msg=e["msg"])
-                                    break
-                                else:
-                                    temp[l] = {}
+    with use_backend(backend), backend.count_deltas():
+        yield
 
-                            temp = temp[l]
 
-                    st.session_state[form_input_errors_key] = errors_values
-                    st.experimental_rerun()
+def _form_block(form_key: str, batched: bool) -> Any:
+    if batched:
+        return ui.form(key=f"{form_key}_form", border=False)
 
-            return None
+    return nullcontext()
 
 
 def _generate_input(
-    schema: Schema,
-    key: str = "",
+    fields: list[FieldPlan],
+    key: str,
     values: dict | None = None,
-    errors: dict[str, InputError] = {},
-    prop_keys: list[str] = [],
+    errors: dict[str | None, Any] = {},
+    nested_layout: NestedLayout = "inline",
 ) -> dict[str, Any]:
     if values is None:
         values = {}
 
-    for prop_key, p in schema.properties.items():
-        if isinstance(p, Property):
-            prop_keys.append(prop_key)
-            values[prop_key] = get_input(
-                p, f"{key}_{prop_key}", values.get(prop_key), errors.get(prop_key)
-            )
-        elif isinstance(p, NestedProperty):
-            nested_schema = schema.definitions[p.reference]
-            nested_schema.definitions = schema.definitions
-
-            st.text(key_to_label(prop_key))
-            with nested_container(key=f"nested_form"):
-                c = st.columns(1)
-                with c[0]:
-                    values[prop_key] = _generate_input(
-                        nested_schema,
-                        f"{key}_{prop_key}",
-                        values.get(prop_key),
-                        errors.get(prop_key, {}),
-                        prop_keys,
+    res = {}
+    tabs = []
+
+    if errors.get(None) is not None:
+        ui.error(errors[None].msg)
+
+    for f in fields:
+        if f.kind == "input":
+            with span("field", f.path):
+                if f.input_fnc is None:
+                    res[f.name] = None
+                elif f.property.type in ("array", "object"):
+                    res[f.name] = render_fragment(
+                        f.key, f.input_fnc, f.property, f.key, values.get(f.name), errors.get(f.name)
                     )
+                else:
+                    res[f.name] = f.input_fnc(
+                        f.property, f.key, values.get(f.name), errors.get(f.name)
+                    )
+        else:
+            optional = f.nullable or f.kind == "recursive"
+            value = values.get(f.name, f.default)
+
+            if optional and not ui.toggle(f.label, value=value is not None, key=f"{f.key}__set"):
+                res[f.name] = None
+
+            elif f.kind == "union":
+                with span("nested", f.path):
+                    res[f.name] = render_fragment(
+                        f.key,
+                        _union_input,
+                        f,
+                        value,
+                        errors.get(f.name, {}),
+                        nested_layout,
+                    )
+
+            elif nested_layout == "tabs" and not optional:
+                tabs.append(f)
+
+            elif nested_layout == "expander" and not optional:
+                if ui.toggle(f.label, key=f"{f.key}__open"):
+                    res[f.name] = render_fragment(
+                        f.key,
+                        _nested_input,
+                        f,
+                        value,
+                        errors.get(f.name, {}),
+                        nested_layout,
+                    )
+                else:
+                    res[f.name] = _collapsed_input(f, value, errors.get(f.name))
+
+            else:
+                if not optional:
+                    ui.text(f.label)
+
+                res[f.name] = render_fragment(
+                    f.key,
+                    _nested_input,
+                    f,
+                    value,
+                    errors.get(f.name, {}),
+                    nested_layout,
+                )
+
+    if len(tabs) > 0:
+        active = ui.radio(
+            "section",
+            options=[f.label for f in tabs],
+            key=f"{key}__tab",
+            horizontal=True,
+            label_visibility="collapsed",
+        )
+
+        for f in tabs:
+            if f.label == active:
+                res[f.name] = render_fragment(
+                    f.key,
+                    _nested_input,
+                    f,
+                    values.get(f.name, f.default),
+                    errors.get(f.name, {}),
+                    nested_layout,
+                )
+            else:
+                res[f.name] = _collapsed_input(f, values.get(f.name, f.default), errors.get(f.name))
+
+    return res
+
+
+def _union_input(
+    f: FieldPlan,
+    value: Any | None,
+    errors: dict[str | None, Any],
+    nested_layout: NestedLayout,
+) -> Any:
+    variant_key = f"{f.key}__variant"
+    initial = _value_variant(f, value)
+
+    if variant_key not in ui.session_state:
+        ui.session_state[variant_key] = initial
+
+    active = ui.selectbox(f.label, options=list(f.variants), key=variant_key)
+
+    if errors.get(None) is not None:
+        ui.error(errors[None].msg)
+
+    res = None
+
+    for tag, v in f.variants.items():
+        if tag != active:
+            ui.session_state.pop(f"{v.key}__seed", None)
+        elif v.kind == "input":
+            res = v.input_fnc(
+                v.property, v.key, _seed(v, value if tag == initial else None), errors.get(tag)
+            )
+            ui.session_state[f"{v.key}__values"] = res
+        else:
+            res = _nested_input(
+                v, value if tag == initial else None, errors.get(tag, {}), nested_layout, True
+            )
+
+            if f.discriminator is not None:
+                res = {**res, f.discriminator: tag}
+
+    return res
+
+
+def _value_variant(f: FieldPlan, value: Any | None) -> str:
+    if f.discriminator is not None and isinstance(value, dict):
+        if str(value.get(f.discriminator)) in f.variants:
+            return str(value.get(f.discriminator))
+
+    for tag, v in f.variants.items():
+        if v.kind == "input" and type(value).__name__ == tag:
+            return tag
+        if v.kind != "input" and isinstance(value, dict):
+            if set(value) <= {g.name for g in expand_field(v)}:
+                return tag
+
+    return next(iter(f.variants))
+
+
+def _nested_input(
+    f: FieldPlan,
+    values: dict | None,
+    errors: dict[str | None, Any],
+    nested_layout: NestedLayout,
+    lazy: bool = False,
+) -> dict[str, Any]:
+    lazy = lazy or nested_layout != "inline"
+
+    if lazy:
+        values = _seed(f, values)
+
+    with span("nested", f.path), ui.container(key=f"{f.key}_con"):
+        c = ui.columns(1)
+        with c[0]:
+            res = _generate_input(
+                expand_field(f),
+                f.key,
+                values,
+                errors,
+                nested_layout,
+            )
+
+    if lazy:
+        ui.session_state[f"{f.key}__values"] = res
+
+    return res
+
+
+def _seed(f: FieldPlan, values: Any | None) -> Any | None:
+    seed_key = f"{f.key}__seed"
+
+    if seed_key not in ui.session_state:
+        ui.session_state[seed_key] = _collapsed_values(f, values)
+
+    return ui.session_state[seed_key]
+
+
+def _collapsed_input(f: FieldPlan, values: dict | None, errors: dict | None) -> dict | None:
+    ui.session_state.pop(f"{f.key}__seed", None)
+
+    if errors:
+        ui.error(f"{f.label} contains invalid values")
+
+    return _collapsed_values(f, values)
+
+
+def _collapsed_values(f: FieldPlan, values: dict | None) -> dict | None:
+    stored = ui.session_state.get(f"{f.key}__values")
+
+    if stored is not None:
+        return stored
+    if values is not None or f.kind != "nested":
+        return values
+
+    return _default_values(f)
+
+
+def _default_values(f: FieldPlan) -> dict[str, Any]:
+    res = {}
+
+    for g in expand_field(f):
+        if g.default is not None:
+            res[g.name] = g.default
+        elif g.kind == "nested" and not g.nullable:
+            res[g.name] = _default_values(g)
+
+    return res
+
+
+def _error_tree(
+    errors: list[dict[str, Any]], paths: dict[tuple[str, ...], FieldKind]
+) -> dict[str | None, Any]:
+    tree = {}
+
+    for e in errors:
+        loc = tuple(e["loc"])
+        depth = next((i for i in range(len(loc), 0, -1) if loc[:i] in paths), 0)
+
+        node = tree
+        for part in loc[: depth - 1 if depth > 0 else 0]:
+            node = node.setdefault(part, {})
+
+        if depth == 0 or paths[loc[:depth]] == "nested":
+            if depth > 0:
+                node = node.setdefault(loc[depth - 1], {})
+
+            rest = loc[depth:]
+            error = node.setdefault(None, InputError())
+            error.msg = _join_msg(
+                error.msg, f"{'.'.join(map(str, rest))}: {e['msg']}" if rest else e["msg"]
+            )
+
+        else:
+            error = node.setdefault(loc[depth - 1], InputError())
+
+            if depth == len(loc):
+                error.msg = _join_msg(error.msg, e["msg"])
+            else:
+                rest = loc[depth + 1 :]
+                error.items[loc[depth]] = _join_msg(
+                    error.items.get(loc[depth]),
+                    f"{'.'.join(map(str, rest))}: {e['msg']}" if rest else e["msg"],
+                )
+
+    return tree
+
 
-    return values
+def _join_msg(msg: str | None, new_msg: str) -> str:
+    return new_msg if msg is None else f"{msg}; {new_msg}"
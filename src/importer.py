@@ -0,0 +1,275 @@
+from typing import Any, BinaryIO, Iterator, Literal
+from io import TextIOWrapper
+import csv
+import json
+
+from pydantic import BaseModel, ValidationError
+
+from src.backends import ui
+from src.batch import batch_adapter
+from src.namespace import register_form
+from src.plan import PlanEngine, get_plan
+
+ImportFormat = Literal["json", "ndjson", "csv"]
+
+FORMATS: dict[str, ImportFormat] = {
+    "json": "json",
+    "ndjson": "ndjson",
+    "jsonl": "ndjson",
+    "csv": "csv",
+}
+
+
+class ImportIssue(BaseModel):
+    record: int
+    loc: str
+    msg: str
+
+
+class ImportReport(BaseModel):
+    processed: int = 0
+    valid: int = 0
+    invalid: int = 0
+    issues: list[ImportIssue] = []
+
+
+def iter_records(
+    file: BinaryIO, format: ImportFormat, chunk_size: int = 1 << 16
+) -> Iterator[dict[str, Any]]:
+    """Parses records from the file chunk by chunk, the file is never read as a whole.
+
+    :param file: Binary file object
+    :type file: BinaryIO
+    :param format: File format, "json" (array or concatenated objects), "ndjson" or "csv"
+    :type format: ImportFormat
+    :param chunk_size: Number of characters read at once, defaults to 65536
+    :type chunk_size: int, optional
+    :return: Iterator of records
+    :rtype: Iterator[dict[str, Any]]
+    """
+
+    text = TextIOWrapper(file, encoding="utf-8", newline="")
+
+    try:
+        if format == "csv":
+            yield from _csv_records(text)
+        else:
+            yield from _json_records(text, chunk_size)
+    finally:
+        text.detach()
+
+
+def import_records(
+    model: type[BaseModel],
+    file: BinaryIO,
+    format: ImportFormat,
+    report: ImportReport | None = None,
+    batch_size: int = 1000,
+    max_issues: int = 1000,
+) -> Iterator[BaseModel]:
+    """Validates records of the file in batches and yields the valid model instances. Invalid
+    records are counted in the report, only the first max_issues errors are kept.
+
+    :param model: Pydantic model class
+    :type model: type[BaseModel]
+    :param file: Binary file object
+    :type file: BinaryIO
+    :param format: File format, "json", "ndjson" or "csv"
+    :type format: ImportFormat
+    :param report: Report updated during the import, defaults to None
+    :type report: ImportReport | None, optional
+    :param batch_size: Number of records validated at once, defaults to 1000
+    :type batch_size: int, optional
+    :param max_issues: Maximum number of kept errors, defaults to 1000
+    :type max_issues: int, optional
+    :return: Iterator of model instances
+    :rtype: Iterator[BaseModel]
+    """
+
+    if report is None:
+        report = ImportReport()
+
+    batch = []
+
+    for record in iter_records(file, format):
+        batch.append(record)
+
+        if len(batch) >= batch_size:
+            yield from _validate_batch(model, batch, report, max_issues)
+            batch = []
+
+    if len(batch) > 0:
+        yield from _validate_batch(model, batch, report, max_issues)
+
+
+def generate_import(
+    model: type[BaseModel],
+    label: str = "Import records",
+    import_btn_label: str = "Import",
+    engine: PlanEngine = "json_schema",
+    batch_size: int = 1000,
+    max_issues: int = 1000,
+    page_size: int = 20,
+) -> Iterator[BaseModel] | None:
+    """Generates a file upload of JSON, NDJSON or CSV records of the model. When the import is
+    started, it returns an iterator of valid model instances, the file is parsed and validated while
+    it is consumed. Progress and a paginated error report are shown.
+
+    :param model: Pydantic model class
+    :type model: type[BaseModel]
+    :param label: File upload label, defaults to "Import records"
+    :type label: str, optional
+    :param import_btn_label: Import button label, defaults to "Import"
+    :type import_btn_label: str, optional
+    :param engine: Schema source of the form key, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :param batch_size: Number of records validated at once, defaults to 1000
+    :type batch_size: int, optional
+    :param max_issues: Maximum number of reported errors, defaults to 1000
+    :type max_issues: int, optional
+    :param page_size: Number of errors on a page of the report, defaults to 20
+    :type page_size: int, optional
+    :return: Iterator of model instances if the import was started
+    :rtype: Iterator[BaseModel] | None
+    """
+
+    form_key = get_plan(model, engine).form_key
+    register_form(form_key)
+    key = f"{form_key}__import"
+    file = ui.file_uploader(label, type=list(FORMATS), key=key)
+    start = ui.button(import_btn_label, key=f"{key}_btn", disabled=file is None)
+
+    if start and file is not None:
+        return _run_import(model, file, key, batch_size, max_issues, page_size)
+
+    if f"{key}__report" in ui.session_state:
+        _show_report(ui.session_state[f"{key}__report"], key, page_size)
+
+    return None
+
+
+def _run_import(
+    model: type[BaseModel],
+    file: Any,
+    key: str,
+    batch_size: int,
+    max_issues: int,
+    page_size: int,
+) -> Iterator[BaseModel]:
+    report = ImportReport()
+    ui.session_state[f"{key}__report"] = report
+    ui.session_state[f"{key}__page"] = 1
+    size = getattr(file, "size", 0)
+    bar = ui.progress(0.0, text="Importing")
+
+    format = FORMATS[file.name.rsplit(".", 1)[-1].lower()]
+
+    for i, instance in enumerate(
+        import_records(model, file, format, report, batch_size, max_issues)
+    ):
+        if i % batch_size == 0 and size > 0:
+            bar.progress(min(file.tell() / size, 1.0), text=f"Imported {report.valid} records")
+
+        yield instance
+
+    bar.progress(1.0, text=f"Imported {report.valid} of {report.processed} records")
+    _show_report(report, key, page_size)
+
+
+def _show_report(report: ImportReport, key: str, page_size: int) -> None:
+    if report.invalid == 0:
+        return
+
+    ui.error(f"{report.invalid} of {report.processed} records are invalid")
+
+    pages = max(-(-len(report.issues) // page_size), 1)
+    page = ui.number_input("Page", min_value=1, max_value=pages, step=1, key=f"{key}__page")
+
+    for issue in report.issues[(page - 1) * page_size : page * page_size]:
+        ui.text(
+            f"Record {issue.record}, {issue.loc}: {issue.msg}"
+            if issue.loc
+            else f"Record {issue.record}: {issue.msg}"
+        )
+
+
+def _validate_batch(
+    model: type[BaseModel], batch: list[dict[str, Any]], report: ImportReport, max_issues: int
+) -> list[BaseModel]:
+    first = report.processed + 1
+    report.processed += len(batch)
+
+    try:
+        res = batch_adapter(model).validate_python(batch)
+    except ValidationError as errs:
+        invalid = set()
+
+        for e in errs.errors():
+            invalid.add(e["loc"][0])
+
+            if len(report.issues) < max_issues:
+                report.issues.append(
+                    ImportIssue(
+                        record=first + e["loc"][0],
+                        loc=".".join(map(str, e["loc"][1:])),
+                        msg=e["msg"],
+                    )
+                )
+
+        report.invalid += len(invalid)
+        res = batch_adapter(model).validate_python(
+            [r for i, r in enumerate(batch) if i not in invalid]
+        )
+
+    report.valid += len(res)
+
+    return res
+
+
+def _csv_records(text: TextIOWrapper) -> Iterator[dict[str, Any]]:
+    for row in csv.DictReader(text):
+        record = {}
+
+        for column, value in row.items():
+            if column is None or value is None or value == "":
+                continue
+
+            node = record
+            path = column.split(".")
+
+            for part in path[:-1]:
+                node = node.setdefault(part, {})
+
+            node[path[-1]] = value
+
+        yield record
+
+
+def _json_records(text: TextIOWrapper, chunk_size: int) -> Iterator[dict[str, Any]]:
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            pos += 1
+
+        if pos >= len(buffer):
+            if eof:
+                return
+
+            buffer, pos = text.read(chunk_size), 0
+            eof = buffer == ""
+            continue
+
+        try:
+            record, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+
+            chunk = text.read(chunk_size)
+            eof = chunk == ""
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        yield record
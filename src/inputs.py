@@ -1,43 +1,83 @@
 from typing import Any, Callable
+from functools import lru_cache, partial
 from datetime import datetime, date, time, timedelta
+from enum import Enum
 
 from pydantic_extra_types.color import Color
-import streamlit as st
-import streamlit_nested_layout
-from streamlit_extras.stylable_container import stylable_container
 
-from src.schemas import InputError, Property
+from src.backends import ui
+from src.options import get_options
+from src.schemas import InputError, ItemType, Property, Schema
+from src.state import ElementStore
 
 
 def get_input(
     p: Property, key: str = "", value: Any | None = None, e: InputError | None = None
 ) -> Any:
+    input_fnc = resolve_input(p)
+
+    if input_fnc is not None:
+        return input_fnc(p, key, value, e)
+
+
+def resolve_input(p: Property, definitions: dict[str, Schema] | None = None) -> Callable | None:
     if p.enum is not None:
-        return _enum_input(p, key, value)
+        return partial(_enum_input, index=_enum_index(p.enum), provider=_enum_provider(p.enum))
 
     match p.type:
         case "boolean":
-            return _boolean_input(p, key, value, e)
+            return _boolean_input
         case "integer":
-            return _integer_input(p, key, value, e)
+            return partial(_integer_input, bounds=_integer_bounds(p))
         case "string":
             if p.format == "color":
-                return _color_input(p, key, value, e)
+                return _color_input
             if p.format == "date":
-                return _date_input(p, key, value, e)
+                return _date_input
             if p.format == "time":
-                return _time_input(p, key, value, e)
+                return _time_input
             if p.format == "date-time":
-                return _date_time_input(p, key, value, e)
+                return _date_time_input
 
-            return _string_input(p, key, value, e)
+            return _string_input
         case "number":
-            return _number_input(p, key, value, e)
+            return partial(_number_input, bounds=_number_bounds(p))
         case "array":
-            return _array_input(p, key, value, e)
+            if p.items.reference is not None:
+                return partial(
+                    _table_input, columns=_table_columns(definitions[p.items.reference])
+                )
+
+            return partial(_array_input, input_fnc=_resolve_item_input(p.items))
         case "object":
             if p.additionalProperties is not None:
-                return _dict_input(p, key, value, e)
+                return partial(_dict_input, input_fnc=_resolve_item_input(p.additionalProperties))
+
+    return None
+
+
+def _resolve_item_input(item: ItemType) -> Callable:
+    if item.enum is not None:
+        return _get_enum_item_input(item.enum)
+
+    match item.type:
+        case "boolean":
+            return _boolean_item_input
+        case "integer":
+            return _integer_item_input
+        case "number":
+            return _number_item_input
+        case "string":
+            if item.format == "color":
+                return _color_item_input
+            if item.format == "date":
+                return _date_item_input
+            if item.format == "time":
+                return _time_item_input
+            if item.format == "date-time":
+                return _date_time_item_input
+
+    return _string_item_input
 
 
 def _boolean_input(
@@ -45,25 +85,21 @@ def _boolean_input(
 ) -> bool:
     value = value if value is not None else p.default
 
-    res = st.checkbox(
+    res = ui.checkbox(
         p.title,
         value=value if value is not None else False,
-        help=p.description,
+        help=_help(p),
         key=key,
         disabled=p.readOnly,
     )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
 
-def _integer_input(
-    p: Property, key: str = "", value: int | None = None, e: InputError | None = None
-) -> int:
-    value = int(value) if value is not None else p.default
-
+def _integer_bounds(p: Property) -> tuple[int | None, int | None]:
     min_value = None
     max_value = None
 
@@ -77,7 +113,21 @@ def _integer_input(
     elif p.exclusiveMaximum is not None:
         max_value = p.exclusiveMaximum - 1
 
-    input = st.number_input if min_value is None or max_value is None else st.slider
+    return min_value, max_value
+
+
+def _integer_input(
+    p: Property,
+    key: str = "",
+    value: int | None = None,
+    e: InputError | None = None,
+    bounds: tuple[int | None, int | None] | None = None,
+) -> int:
+    value = int(value) if value is not None else p.default
+
+    min_value, max_value = bounds if bounds is not None else _integer_bounds(p)
+
+    input = ui.number_input if min_value is None or max_value is None else ui.slider
 
     if value is None:
         if min_value is not None:
@@ -97,7 +147,7 @@ def _integer_input(
 
     res = input(
         label=p.title,
-        help=p.description,
+        help=_help(p),
         step=int(p.multipleOf) if p.multipleOf is not None else 1,
         value=value,
         min_value=min_value,
@@ -106,17 +156,13 @@ def _integer_input(
         disabled=p.readOnly,
     )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
 
-def _number_input(
-    p: Property, key: str = "", value: float | None = None, e: InputError | None = None
-) -> float:
-    value = float(value) if value is not None else p.default
-
+def _number_bounds(p: Property) -> tuple[float | None, float | None]:
     min_value = None
     max_value = None
 
@@ -130,7 +176,21 @@ def _number_input(
     elif p.exclusiveMaximum is not None:
         max_value = float(p.exclusiveMaximum - 0.01)
 
-    input = st.number_input if min_value is None or max_value is None else st.slider
+    return min_value, max_value
+
+
+def _number_input(
+    p: Property,
+    key: str = "",
+    value: float | None = None,
+    e: InputError | None = None,
+    bounds: tuple[float | None, float | None] | None = None,
+) -> float:
+    value = float(value) if value is not None else p.default
+
+    min_value, max_value = bounds if bounds is not None else _number_bounds(p)
+
+    input = ui.number_input if min_value is None or max_value is None else ui.slider
 
     if value is None:
         if min_value is not None:
@@ -140,7 +200,7 @@ def _number_input(
 
     res = input(
         label=p.title,
-        help=p.description,
+        help=_help(p),
         value=value,
         min_value=min_value,
         max_value=max_value,
@@ -149,8 +209,8 @@ def _number_input(
         disabled=p.readOnly,
     )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
@@ -160,47 +220,148 @@ def _string_input(
 ) -> str:
     value = str(value) if value is not None else p.default
 
-    res = st.text_input(
+    res = ui.text_input(
         label=p.title,
         value=value,
-        help=p.description,
+        help=_help(p),
         max_chars=p.maxLength,
         key=key,
         type="password" if p.format is not None and p.format == "password" else "default",
         disabled=p.readOnly,
     )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
 
 def _enum_input(
-    p: Property, key: str = "", value: Any | None = None, e: InputError | None = None
+    p: Property,
+    key: str = "",
+    value: Any | None = None,
+    e: InputError | None = None,
+    index: dict[Any, int] | None = None,
+    provider: Callable | None = None,
 ) -> Any:
-    value = value if value is not None else p.default
-
-    if value is not None:
-        default_index = p.enum.index(value)
+    value = _enum_value(value if value is not None else p.default)
+    page_size = get_options().choice_page_size
+
+    if page_size is not None and len(p.enum) > page_size:
+        res = _choice_input(
+            p.title,
+            key,
+            value,
+            provider if provider is not None else _enum_provider(p.enum),
+            page_size,
+            help=_help(p),
+            disabled=p.readOnly,
+        )
     else:
-        default_index = 0
+        if index is None:
+            index = _enum_index(p.enum)
 
-    res = st.selectbox(
-        label=p.title,
-        options=p.enum,
-        index=default_index,
-        help=p.description,
-        key=key,
-        disabled=p.readOnly,
-    )
+        options, i = _enum_selection(p.enum, index, value)
+        res = ui.selectbox(
+            label=p.title,
+            options=options,
+            index=i,
+            help=_help(p),
+            key=key,
+            disabled=p.readOnly,
+        )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
 
+def _enum_index(options: list[Any]) -> dict[Any, int]:
+    index = {}
+
+    for i, o in enumerate(options):
+        index.setdefault(o, i)
+
+    return index
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _enum_selection(
+    options: list[Any], index: dict[Any, int], value: Any | None
+) -> tuple[list[Any], int]:
+    if value is None:
+        return options, 0
+    if value in index:
+        return options, index[value]
+
+    return [value, *options], 0
+
+
+def _enum_provider(options: list[Any]) -> Callable[[str, int, int], tuple[list[Any], int]]:
+    labels = [str(o).lower() for o in options]
+
+    @lru_cache(maxsize=64)
+    def _page(query: str, page: int, page_size: int) -> tuple[list[Any], int]:
+        if query:
+            matches = [o for o, label in zip(options, labels) if query.lower() in label]
+        else:
+            matches = options
+
+        return matches[page * page_size : (page + 1) * page_size], len(matches)
+
+    return _page
+
+
+def _choice_input(
+    label: str,
+    key: str,
+    value: Any | None,
+    provider: Callable[[str, int, int], tuple[list[Any], int]],
+    page_size: int,
+    label_visibility: str = "visible",
+    **kwargs: Any,
+) -> Any:
+    c1, c2 = ui.columns((3, 1))
+    with c1:
+        query = ui.text_input(
+            "search",
+            key=f"{key}__search",
+            placeholder=f"Search {label}",
+            label_visibility="collapsed",
+        )
+
+    page_key = f"{key}__page"
+    _, total = provider(query, 0, page_size)
+    pages = max(-(-total // page_size), 1)
+
+    if ui.session_state.get(page_key, 1) > pages:
+        ui.session_state[page_key] = pages
+
+    with c2:
+        page = ui.number_input(
+            "page", min_value=1, max_value=pages, step=1, key=page_key, label_visibility="collapsed"
+        )
+
+    options = list(provider(query, page - 1, page_size)[0])
+    current = ui.session_state.get(key, value)
+
+    if current is not None and current not in options:
+        options.insert(0, current)
+
+    return ui.selectbox(
+        label=label,
+        options=options,
+        index=options.index(current) if current is not None else 0,
+        key=key,
+        label_visibility=label_visibility,
+        **kwargs,
+    )
+
+
 def _color_input(
     p: Property, key: str = "", value: Color | None = None, e: InputError | None = None
 ) -> Color:
@@ -211,17 +372,17 @@ def _color_input(
     )
 
     res = Color(
-        st.color_picker(
+        ui.color_picker(
             label=p.title,
             value=value,
-            help=p.description,
+            help=_help(p),
             key=key,
             disabled=p.readOnly,
         )
     )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
@@ -231,16 +392,16 @@ def _date_input(
 ) -> date:
     value = value if value is not None else p.default
 
-    res = st.date_input(
+    res = ui.date_input(
         p.title,
-        help=p.description,
+        help=_help(p),
         value=value,
         key=key,
         disabled=p.readOnly,
     )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
@@ -252,17 +413,17 @@ def _time_input(
 
     step = timedelta(minutes=1)
 
-    res = st.time_input(
+    res = ui.time_input(
         p.title,
-        help=p.description,
+        help=_help(p),
         value=value,
         step=step,
         key=key,
         disabled=p.readOnly,
     )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
@@ -272,27 +433,26 @@ def _date_time_input(
 ) -> datetime:
     value = value if value is not None else p.default
 
+    if get_options().compact:
+        res = _date_time_text_input(p.title, key, value, help=_help(p), disabled=p.readOnly)
+
+        if e is not None and e.msg is not None:
+            ui.error(e.msg)
+
+        return res
+
     date_value, time_value = None, None
 
     if value is not None:
         date_value = value.date()
         time_value = value.time()
 
-    st.text(p.title)
-    with stylable_container(
-        key=f"datetime_con",
-        css_styles="""
-                {
-                    border: 1px solid #48494d;
-                    border-radius: 0.5rem;
-                    padding: calc(1em - 1px)
-                }
-                """,
-    ):
-        c1, c2 = st.columns(2)
+    ui.text(p.title)
+    with ui.container(key=f"datetime_con_{key}"):
+        c1, c2 = ui.columns(2)
 
         with c1:
-            date_value = st.date_input(
+            date_value = ui.date_input(
                 p.title,
                 value=date_value,
                 key=f"{key}_date",
@@ -301,7 +461,7 @@ def _date_time_input(
             )
         with c2:
             step = timedelta(minutes=1)
-            time_value = st.time_input(
+            time_value = ui.time_input(
                 p.title,
                 value=time_value,
                 step=step,
@@ -321,16 +481,40 @@ def _date_time_input(
             time_value if time_value is not None else now.time(),
         )
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
 
     return res
 
 
+def _date_time_text_input(
+    label: str, key: str, value: datetime | str | None, **kwargs: Any
+) -> datetime | str | None:
+    text = ui.text_input(
+        label,
+        value=value.isoformat(sep=" ") if isinstance(value, datetime) else value,
+        key=key,
+        placeholder="YYYY-MM-DD HH:MM:SS",
+        **kwargs,
+    )
+
+    if not text:
+        return None
+
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def _help(p: Property) -> str | None:
+    return p.description if get_options().show_help else None
+
+
 def _boolean_item_input(key: str, value: bool | None = None) -> bool:
     value = value if value is not None else False
 
-    return st.checkbox("item", value=value, key=key, label_visibility=False)
+    return ui.checkbox("item", value=value, key=key, label_visibility=False)
 
 
 def _integer_item_input(key: str, value: int | None = None) -> Any:
@@ -339,7 +523,7 @@ def _integer_item_input(key: str, value: int | None = None) -> Any:
     if value is None:
         value = 0
 
-    return st.number_input(
+    return ui.number_input(
         label="item",
         key=key,
         value=value,
@@ -351,33 +535,41 @@ def _integer_item_input(key: str, value: int | None = None) -> Any:
 def _number_item_input(key: str, value: float | None = None) -> Any:
     value = float(value) if value is not None else None
 
-    return st.number_input(label="item", key=key, value=value, label_visibility="collapsed")
+    return ui.number_input(label="item", key=key, value=value, label_visibility="collapsed")
 
 
 def _string_item_input(key: str, value: str | None = None) -> Any:
     value = str(value) if value is not None else None
 
-    return st.text_input(label="item", key=key, value=value, label_visibility="collapsed")
+    return ui.text_input(label="item", key=key, value=value, label_visibility="collapsed")
 
 
 def _color_item_input(key: str, value: Color | None = None) -> Any:
     value = value.as_hex() if value is not None else None
 
-    return Color(st.color_picker(label="item", key=key, value=value, label_visibility="collapsed"))
+    return Color(ui.color_picker(label="item", key=key, value=value, label_visibility="collapsed"))
 
 
 def _get_enum_item_input(options: list[Any]) -> Callable:
+    index = _enum_index(options)
+    provider = _enum_provider(options)
+
     def _inner(key: str, value: Any | None = None) -> Any:
-        if value is not None:
-            default_index = options.index(value)
-        else:
-            default_index = 0
+        value = _enum_value(value)
+        page_size = get_options().choice_page_size
+
+        if page_size is not None and len(options) > page_size:
+            return _choice_input(
+                "enum_item", key, value, provider, page_size, label_visibility="collapsed"
+            )
+
+        shown, i = _enum_selection(options, index, value)
 
-        return st.selectbox(
+        return ui.selectbox(
             label="enum_item",
             key=key,
-            options=options,
-            index=default_index,
+            options=shown,
+            index=i,
             label_visibility="collapsed",
         )
 
@@ -387,7 +579,7 @@ def _get_enum_item_input(options: list[Any]) -> Callable:
 def _date_item_input(key: str, value: date | None = None) -> date | None:
     value = value if value is not None else None
 
-    return st.date_input("date_item", value=value, key=key, label_visibility="collapsed")
+    return ui.date_input("date_item", value=value, key=key, label_visibility="collapsed")
 
 
 def _time_item_input(key: str, value: time | None = None) -> time | None:
@@ -395,7 +587,7 @@ def _time_item_input(key: str, value: time | None = None) -> time | None:
 
     step = timedelta(minutes=1)
 
-    return st.time_input(
+    return ui.time_input(
         "time_item", value=value, step=step, key=key, label_visibility="collapsed"
     )
 
@@ -403,26 +595,20 @@ def _time_item_input(key: str, value: time | None = None) -> time | None:
 def _date_time_item_input(key: str, value: datetime | None = None) -> datetime | None:
     value = value if value is not None else None
 
+    if get_options().compact:
+        return _date_time_text_input("item", key, value, label_visibility="collapsed")
+
     date_value, time_value = None, None
 
     if value is not None:
         date_value = value.date()
         time_value = value.time()
 
-    with stylable_container(
-        key=f"datetime_con",
-        css_styles="""
-                {
-                    border: 1px solid #48494d;
-                    border-radius: 0.5rem;
-                    padding: calc(1em - 1px)
-                }
-                """,
-    ):
-        c1, c2 = st.columns(2)
+    with ui.container(key=f"datetime_con_{key}"):
+        c1, c2 = ui.columns(2)
 
         with c1:
-            date_value = st.date_input(
+            date_value = ui.date_input(
                 "date_item",
                 value=date_value,
                 key=f"{key}_date",
@@ -430,7 +616,7 @@ def _date_time_item_input(key: str, value: datetime | None = None) -> datetime |
             )
         with c2:
             step = timedelta(minutes=1)
-            time_value = st.time_input(
+            time_value = ui.time_input(
                 "time_input",
                 value=time_value,
                 step=step,
@@ -450,171 +636,440 @@ def _date_time_item_input(key: str, value: datetime | None = None) -> datetime |
 
 
 def _array_input(
-    p: Property, key: str = "", values: list[Any] | None = None, e: InputError | None = None
+    p: Property,
+    key: str = "",
+    values: list[Any] | None = None,
+    e: InputError | None = None,
+    input_fnc: Callable | None = None,
 ) -> list[Any]:
+    if get_options().tabular or get_options().compact:
+        return _table_input(p, key, values, e)
+
     initialize = False
 
-    if key not in st.session_state:
-        st.session_state[key] = {}
+    if key not in ui.session_state:
+        ui.session_state[key] = ElementStore()
         initialize = True
 
-    elements = st.session_state[key]
+    store = ui.session_state[key]
+    page_size = get_options().array_page_size
+    batched = get_options().batched
+    reorderable = get_options().reorderable and not batched
 
-    if p.items.enum is not None:
-        input_fnc = _get_enum_item_input(p.items.enum)
-    else:
-        match p.items.type:
-            case "boolean":
-                input_fnc = _boolean_item_input
-            case "integer":
-                input_fnc = _integer_item_input
-            case "number":
-                input_fnc = _number_item_input
-            case "string":
-                if p.items.format == "color":
-                    input_fnc = _color_item_input
-                elif p.items.format == "date":
-                    input_fnc = _date_item_input
-                elif p.items.format == "time":
-                    input_fnc = _time_item_input
-                elif p.items.format == "date-time":
-                    input_fnc = _date_time_item_input
-                else:
-                    input_fnc = _string_item_input
-
-    def _add_item_input(value: Any | None = None) -> Callable:
-        index = max(elements.keys()) + 1 if len(elements) > 0 else 0
-
-        def _inner() -> Any:
-            c1, c2 = st.columns((1, 9))
-            with c2:
-                res = input_fnc(f"{key}_{index}", value)
-            with c1:
-                if st.button(":heavy_minus_sign:", key=f"rmbtn_{key}_{index}"):
-                    del elements[index]
-                    st.experimental_rerun()
-
-            return res
-
-        elements[index] = _inner
-
-    st.text(p.title)
-    with stylable_container(
-        key=f"array_con_{key}",
-        css_styles="""
-                {
-                    border: 1px solid #48494d;
-                    border-radius: 0.5rem;
-                    padding: calc(1em - 1px)
-                }
-                """,
-    ):
+    if input_fnc is None:
+        input_fnc = _resolve_item_input(p.items)
+
+    ui.text(p.title)
+    with ui.container(key=f"array_con_{key}"):
         if initialize and values is not None:
             for v in values:
-                _add_item_input(v)
+                store.add(v)
+
+        if batched and _apply_staged_edits(key, store) > 0:
+            if page_size is not None:
+                ui.session_state[f"{key}__goto"] = -(-len(store) // page_size)
 
-        arr = [i() for i in elements.values()]
+        item_errors = _item_errors(e, ui.session_state.get(f"{key}__positions", []))
+        source = ui.session_state.pop(f"{key}__duplicate", None)
+        copy = store.duplicate(source) if source in store.order else None
 
-        if p.maxItems is None or len(elements) < p.maxItems:
-            if st.button(":heavy_plus_sign:", key=f"{p.title}_btn"):
-                _add_item_input()
-                st.experimental_rerun()
+        if page_size is None:
+            window = list(store.order)
+        else:
+            window = _array_window(key, store.order, page_size)
+
+            if ui.session_state.get(f"{key}__window") != window:
+                for index in window:
+                    store.seeds[index] = store.values[index]
+
+                ui.session_state[f"{key}__window"] = window
+
+        for index in window:
+            if index == copy:
+                store.seeds[index] = store.values[source]
+
+            store.values[index] = _array_item(
+                key, store, index, input_fnc, batched, reorderable, item_errors.get(index)
+            )
+
+        if copy is not None and copy not in window:
+            store.seeds[copy] = store.values[copy] = store.values[source]
+
+        arr = [store.values[index] for index in store.order]
+
+        ui.session_state[f"{key}__positions"] = [
+            index for index, a in zip(store.order, arr) if a is not None
+        ]
+
+        if batched:
+            _staged_add_input(key, len(store), p.maxItems)
+        elif p.maxItems is None or len(store) < p.maxItems:
+            ui.button(
+                ":heavy_plus_sign:",
+                key=f"{key}__addbtn",
+                on_click=_add_item,
+                args=(key, store, page_size),
+            )
 
     res = [a for a in arr if a is not None]
 
-    if e is not None:
-        st.error(e.msg)
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
+
+    return res
+
+
+def _array_item(
+    key: str,
+    store: ElementStore,
+    index: int,
+    input_fnc: Callable,
+    batched: bool,
+    reorderable: bool,
+    msg: str | None = None,
+) -> Any:
+    if reorderable:
+        c1, c3, c4, c2 = ui.columns((1, 1, 1, 7))
+        with c3:
+            ui.button(
+                ":arrow_up:",
+                key=f"{key}_{index}__upbtn",
+                on_click=store.move,
+                args=(index, -1),
+            )
+        with c4:
+            ui.button(
+                ":heavy_plus_sign:",
+                key=f"{key}_{index}__dupbtn",
+                on_click=_duplicate_item,
+                args=(key, index),
+            )
+    else:
+        c1, c2 = ui.columns((1, 9))
+    with c2:
+        res = input_fnc(f"{key}_{index}", store.seeds[index])
+    with c1:
+        if batched:
+            ui.checkbox(":wastebasket:", key=f"{key}_{index}__rmchk")
+        else:
+            ui.button(
+                ":heavy_minus_sign:",
+                key=f"{key}_{index}__rmbtn",
+                on_click=_remove_item,
+                args=(key, store, index),
+            )
+
+    if msg is not None:
+        ui.error(msg)
 
     return res
 
 
+def _add_item(key: str, store: ElementStore, page_size: int | None = None) -> None:
+    store.add()
+
+    if page_size is not None:
+        ui.session_state[f"{key}__goto"] = -(-len(store) // page_size)
+
+
+def _duplicate_item(key: str, index: int) -> None:
+    ui.session_state[f"{key}__duplicate"] = index
+
+
+def _remove_item(key: str, store: ElementStore, index: int) -> None:
+    store.remove(index)
+    item_key = f"{key}_{index}"
+
+    for k in [
+        k
+        for k in ui.session_state.keys()
+        if k == item_key or str(k).startswith(f"{item_key}_")
+    ]:
+        del ui.session_state[k]
+
+
+def _apply_staged_edits(key: str, store: ElementStore) -> int:
+    for index in [i for i in store.order if ui.session_state.get(f"{key}_{i}__rmchk")]:
+        _remove_item(key, store, index)
+
+    added = ui.session_state.get(f"{key}__add") or 0
+
+    for _ in range(added):
+        store.add()
+
+    return added
+
+
+def _staged_add_input(key: str, length: int, max_items: int | None) -> None:
+    ui.session_state[f"{key}__add"] = 0
+
+    ui.number_input(
+        "Add items",
+        min_value=0,
+        max_value=max_items - length if max_items is not None else None,
+        step=1,
+        key=f"{key}__add",
+        help="Items are added and checked items are removed when the form is submitted",
+    )
+
+
+def _item_errors(e: InputError | None, positions: list[int]) -> dict[int, str]:
+    if e is None:
+        return {}
+
+    return {
+        positions[pos]: msg
+        for pos, msg in e.items.items()
+        if isinstance(pos, int) and pos < len(positions)
+    }
+
+
+def _array_window(key: str, indices: list[int], page_size: int) -> list[int]:
+    page_key = f"{key}__page"
+    jump_key = f"{key}__jump"
+    n_pages = max(1, -(-len(indices) // page_size))
+
+    jump = ui.session_state.get(jump_key, 1)
+    page = ui.session_state.pop(f"{key}__goto", None) or ui.session_state.get(page_key, 1)
+
+    if jump != ui.session_state.get(f"{key}__jumped", 1):
+        page = (jump - 1) // page_size + 1
+
+    ui.session_state[page_key] = min(max(page, 1), n_pages)
+    ui.session_state[jump_key] = min(max(jump, 1), max(len(indices), 1))
+    ui.session_state[f"{key}__jumped"] = ui.session_state[jump_key]
+
+    c1, c2 = ui.columns(2)
+    with c1:
+        page = ui.number_input(
+            f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key=page_key
+        )
+    with c2:
+        ui.number_input(
+            "Go to item", min_value=1, max_value=max(len(indices), 1), step=1, key=jump_key
+        )
+
+    start = (page - 1) * page_size
+
+    return indices[start : start + page_size]
+
+
 def _dict_input(
-    p: Property, key: str = "", values: dict[str, Any] | None = None, e: InputError | None = None
+    p: Property,
+    key: str = "",
+    values: dict[str, Any] | None = None,
+    e: InputError | None = None,
+    input_fnc: Callable | None = None,
 ) -> dict[str, Any]:
+    if get_options().tabular or get_options().compact:
+        return _table_input(p, key, values, e)
+
     initialize = False
 
-    if key not in st.session_state:
-        st.session_state[key] = {}
+    if key not in ui.session_state:
+        ui.session_state[key] = ElementStore()
         initialize = True
 
-    records = st.session_state[key]
+    store = ui.session_state[key]
+    batched = get_options().batched
 
-    if p.additionalProperties.enum is not None:
-        input_fnc = _get_enum_item_input(p.items.enum)
-    else:
-        match p.additionalProperties.type:
-            case "boolean":
-                input_fnc = _boolean_item_input
-            case "integer":
-                input_fnc = _integer_item_input
-            case "number":
-                input_fnc = _number_item_input
-            case "string":
-                if p.additionalProperties.format == "color":
-                    input_fnc = _color_item_input
-                elif p.additionalProperties.format == "date":
-                    input_fnc = _date_item_input
-                elif p.additionalProperties.format == "time":
-                    input_fnc = _time_item_input
-                elif p.additionalProperties.format == "date-time":
-                    input_fnc = _date_time_item_input
-                else:
-                    input_fnc = _string_item_input
-
-    def _add_item_input(value: Any | None = None) -> Callable:
-        index = max(records.keys()) + 1 if len(records) > 0 else 0
-
-        def _inner() -> Any:
-            if value is not None:
-                vk, vv = value
-            else:
-                vk, vv = None, None
-            c1, c2 = st.columns((1, 9))
-            with c2:
-                c11, c22 = st.columns((2, 3))
-                with c11:
-                    item_key = st.text_input(
-                        "item_key",
-                        value=vk,
-                        key=f"{key}_{index}_key",
-                        label_visibility="collapsed",
-                    )
-                with c22:
-                    item_value = input_fnc(f"{key}_{index}_value", vv)
-            with c1:
-                if st.button(":heavy_minus_sign:", key=f"rmbtn_{key}_{index}"):
-                    del records[index]
-                    st.experimental_rerun()
-
-            return item_key, item_value
-
-        records[index] = _inner
-
-    st.text(p.title)
-    with stylable_container(
-        key=f"dict_con",
-        css_styles="""
-                {
-                    border: 1px solid #48494d;
-                    border-radius: 0.5rem;
-                    padding: calc(1em - 1px)
-                }
-                """,
-    ):
+    if input_fnc is None:
+        input_fnc = _resolve_item_input(p.additionalProperties)
+
+    ui.text(p.title)
+    with ui.container(key=f"dict_con_{key}"):
         if initialize and values is not None:
             for k, v in values.items():
-                _add_item_input((k, v))
+                store.add((k, v))
+
+        if batched:
+            _apply_staged_edits(key, store)
 
-        res = dict([i() for i in records.values()])
+        item_errors = e.items if e is not None else {}
 
-        if p.maxItems is None or len(records) < p.maxItems:
-            if st.button(":heavy_plus_sign:", key=f"{p.title}_btn"):
-                _add_item_input()
-                st.experimental_rerun()
+        for index in store.order:
+            store.values[index] = _dict_item(key, store, index, input_fnc, batched, item_errors)
+
+        res = dict(store.values[index] for index in store.order)
+
+        if batched:
+            _staged_add_input(key, len(store), p.maxItems)
+        elif p.maxItems is None or len(store) < p.maxItems:
+            ui.button(
+                ":heavy_plus_sign:",
+                key=f"{key}__addbtn",
+                on_click=_add_item,
+                args=(key, store),
+            )
 
     res = {k: v for k, v in res.items() if v is not None}
 
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
+
+    return res
+
+
+def _dict_item(
+    key: str,
+    store: ElementStore,
+    index: int,
+    input_fnc: Callable,
+    batched: bool,
+    item_errors: dict[int | str, str],
+) -> tuple[str | None, Any]:
+    vk, vv = store.seeds[index] if store.seeds[index] is not None else (None, None)
+
+    c1, c2 = ui.columns((1, 9))
+    with c2:
+        c11, c22 = ui.columns((2, 3))
+        with c11:
+            item_key = ui.text_input(
+                "item_key",
+                value=vk,
+                key=f"{key}_{index}_key",
+                label_visibility="collapsed",
+            )
+        with c22:
+            item_value = input_fnc(f"{key}_{index}_value", vv)
+    with c1:
+        if batched:
+            ui.checkbox(":wastebasket:", key=f"{key}_{index}__rmchk")
+        else:
+            ui.button(
+                ":heavy_minus_sign:",
+                key=f"{key}_{index}__rmbtn",
+                on_click=_remove_item,
+                args=(key, store, index),
+            )
+
+    if item_key in item_errors:
+        ui.error(item_errors[item_key])
+
+    return item_key, item_value
+
+
+def _table_input(
+    p: Property,
+    key: str = "",
+    values: list[Any] | dict[str, Any] | None = None,
+    e: InputError | None = None,
+    columns: dict[str, ItemType] | None = None,
+) -> list[Any] | dict[str, Any]:
+    import pandas as pd
+
+    if p.type == "object":
+        columns = {"key": ItemType(type="string"), "value": p.additionalProperties}
+        rows = [{"key": k, "value": v} for k, v in (values or {}).items()]
+    elif columns is None:
+        columns = {"value": p.items}
+        rows = [{"value": v} for v in values or []]
+    else:
+        rows = values or []
+
+    data = pd.DataFrame(
+        [{c: _to_cell(item, r.get(c)) for c, item in columns.items()} for r in rows],
+        columns=list(columns),
+    )
+
+    ui.text(p.title)
+    edited = ui.data_editor(
+        data,
+        key=key,
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        disabled=p.readOnly,
+        column_config={c: _column_config(c, item) for c, item in columns.items()},
+    )
+
+    records = [
+        {c: _from_cell(item, r.get(c)) for c, item in columns.items()}
+        for r in edited.to_dict("records")
+    ]
+
+    if p.type == "object":
+        res = {r["key"]: r["value"] for r in records if r["key"] is not None and r["value"] is not None}
+    elif list(columns) == ["value"]:
+        res = [r["value"] for r in records if r["value"] is not None]
+    else:
+        res = [r for r in records if any(v is not None for v in r.values())]
+
+    if e is not None and e.msg is not None:
+        ui.error(e.msg)
+
     if e is not None:
-        st.error(e.msg)
+        for item, msg in e.items.items():
+            ui.error(f"Row {item + 1}: {msg}" if isinstance(item, int) else f"{item}: {msg}")
 
     return res
+
+
+def _table_columns(schema: Schema) -> dict[str, ItemType]:
+    return {
+        prop_key: ItemType(type=prop.type, enum=prop.enum, format=prop.format)
+        for prop_key, prop in schema.properties.items()
+        if isinstance(prop, Property) and prop.type not in ("array", "object")
+    }
+
+
+def _column_config(label: str, item: ItemType) -> Any:
+    if item.enum is not None:
+        return ui.column_config.SelectboxColumn(label, options=item.enum)
+
+    match item.type:
+        case "boolean":
+            return ui.column_config.CheckboxColumn(label)
+        case "integer":
+            return ui.column_config.NumberColumn(label, step=1)
+        case "number":
+            return ui.column_config.NumberColumn(label)
+        case "string":
+            if item.format == "date":
+                return ui.column_config.DateColumn(label)
+            if item.format == "time":
+                return ui.column_config.TimeColumn(label)
+            if item.format == "date-time":
+                return ui.column_config.DatetimeColumn(label)
+
+    return ui.column_config.TextColumn(label)
+
+
+def _to_cell(item: ItemType, value: Any) -> Any:
+    if isinstance(value, Color):
+        return value.as_hex()
+
+    return value
+
+
+def _from_cell(item: ItemType, value: Any) -> Any:
+    import pandas as pd
+
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+
+    if isinstance(value, pd.Timestamp):
+        if item.format == "date":
+            return value.date()
+        if item.format == "time":
+            return value.time()
+
+        return value.to_pydatetime()
+
+    if item.enum is not None:
+        return value
+
+    match item.type:
+        case "boolean":
+            return bool(value)
+        case "integer":
+            return int(value)
+        case "number":
+            return float(value)
+        case "string":
+            if item.format == "color":
+                return Color(value)
+            if item.format is None or item.format == "password":
+                return str(value)
+
+    return value
@@ -0,0 +1,254 @@
+from typing import Any, Literal, Union, get_args, get_origin
+from types import NoneType, UnionType
+from datetime import datetime, date, time
+from enum import Enum
+
+from pydantic import BaseModel, SecretBytes, SecretStr
+from pydantic.fields import FieldInfo
+from pydantic_extra_types.color import Color
+
+from src.schemas import (
+    ItemType,
+    NestedProperty,
+    Property,
+    PropertyFormat,
+    PropertyType,
+    Schema,
+    UnionProperty,
+)
+
+
+def model_schema(model_class: type[BaseModel]) -> Schema:
+    """Builds the schema of the model directly from its fields, without the JSON schema round-trip.
+
+    :param model_class: Pydantic model class
+    :type model_class: type[BaseModel]
+    :return: Schema of the model with all nested models in definitions
+    :rtype: Schema
+    """
+
+    definitions = {}
+    schema = _model_schema(model_class, definitions)
+    schema.definitions = definitions
+
+    return schema
+
+
+def _model_schema(model_class: type[BaseModel], definitions: dict[str, Schema]) -> Schema:
+    properties = {}
+    required = []
+
+    for attribute, field in model_class.model_fields.items():
+        name = input_name(attribute, field)
+
+        if field.is_required():
+            required.append(name)
+
+        if _is_model(field.annotation):
+            properties[name] = NestedProperty.model_construct(
+                reference=_define(field.annotation, definitions),
+                default=_default(field),
+                nullable=False,
+            )
+        elif _is_model(_optional(field.annotation)):
+            properties[name] = NestedProperty.model_construct(
+                reference=_define(_optional(field.annotation), definitions),
+                default=_default(field),
+                nullable=True,
+            )
+        elif get_origin(field.annotation) in (Union, UnionType):
+            properties[name] = _union_property(attribute, field, definitions)
+        else:
+            properties[name] = _property(attribute, field, definitions)
+
+    return Schema.model_construct(
+        title=model_class.model_config.get("title") or model_class.__name__,
+        properties=properties,
+        required=required,
+        definitions=None,
+    )
+
+
+def _default(field: FieldInfo) -> Any:
+    if field.is_required() or field.default_factory is not None:
+        return None
+
+    if isinstance(field.default, (SecretStr, SecretBytes)):
+        return None
+
+    if isinstance(field.default, BaseModel):
+        return field.default.model_dump(by_alias=True)
+
+    return field.default
+
+
+def input_name(name: str, field: FieldInfo) -> str:
+    """Returns the key under which the model validates the field, its alias if it has a string alias.
+
+    :param name: Attribute name of the field
+    :type name: str
+    :param field: Field of the model
+    :type field: FieldInfo
+    :return: Key of the field in the validated values
+    :rtype: str
+    """
+
+    if isinstance(field.validation_alias, str):
+        return field.validation_alias
+
+    return field.alias or name
+
+
+def model_reference(model_class: type[BaseModel]) -> str:
+    """Returns the key of the model in the schema definitions.
+
+    :param model_class: Pydantic model class
+    :type model_class: type[BaseModel]
+    :return: Definition key
+    :rtype: str
+    """
+
+    return f"{model_class.__module__}.{model_class.__qualname__}"
+
+
+def _define(model_class: type[BaseModel], definitions: dict[str, Schema]) -> str:
+    reference = model_reference(model_class)
+
+    if reference not in definitions:
+        definitions[reference] = None
+        definitions[reference] = _model_schema(model_class, definitions)
+
+    return reference
+
+
+def _property(name: str, field: FieldInfo, definitions: dict[str, Schema]) -> Property:
+    annotation = field.annotation
+    constraints = _constraints(field)
+    is_sequence = get_origin(annotation) in (list, set, tuple)
+    is_mapping = get_origin(annotation) is dict
+
+    values = {
+        "title": field.title or name.title().replace("_", " "),
+        "description": field.description,
+        "default": _default(field),
+        "examples": field.examples,
+        "multipleOf": constraints.get("multiple_of"),
+        "minimum": constraints.get("ge"),
+        "maximum": constraints.get("le"),
+        "exclusiveMinimum": constraints.get("gt"),
+        "exclusiveMaximum": constraints.get("lt"),
+        "pattern": constraints.get("pattern"),
+    }
+
+    if is_sequence:
+        values["type"] = "array"
+        values["items"] = _item_type(
+            get_args(annotation)[0] if get_args(annotation) else Any, definitions
+        )
+        values["minItems"] = constraints.get("min_length")
+        values["maxItems"] = constraints.get("max_length")
+    elif is_mapping:
+        values["type"] = "object"
+        values["additionalProperties"] = _item_type(get_args(annotation)[1], definitions)
+    else:
+        item = _item_type(annotation, definitions)
+        values["type"] = item.type
+        values["format"] = item.format
+        values["enum"] = item.enum
+        values["minLength"] = constraints.get("min_length")
+        values["maxLength"] = constraints.get("max_length")
+
+    return Property.model_construct(**{k: v for k, v in values.items() if v is not None})
+
+
+def _union_property(name: str, field: FieldInfo, definitions: dict[str, Schema]) -> UnionProperty:
+    discriminator = field.discriminator if isinstance(field.discriminator, str) else None
+    variants = {}
+
+    for a in get_args(field.annotation):
+        if a is NoneType:
+            continue
+
+        if _is_model(a):
+            tag = str(get_args(a.model_fields[discriminator].annotation)[0]) if discriminator else a.__name__
+            variants[tag] = NestedProperty.model_construct(
+                reference=_define(a, definitions), nullable=False
+            )
+        else:
+            variants[a.__name__] = _property(name, FieldInfo.from_annotation(a), definitions)
+
+    return UnionProperty.model_construct(
+        title=field.title or name.title().replace("_", " "),
+        description=field.description,
+        default=_default(field),
+        variants=variants,
+        discriminator=discriminator,
+        nullable=NoneType in get_args(field.annotation),
+    )
+
+
+def _item_type(annotation: Any, definitions: dict[str, Schema]) -> ItemType:
+    if _is_model(annotation):
+        return ItemType.model_construct(reference=_define(annotation, definitions))
+
+    if get_origin(annotation) is Literal:
+        options = list(get_args(annotation))
+        return ItemType.model_construct(type=_json_type(type(options[0])), enum=options)
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        options = [o.value for o in annotation]
+        return ItemType.model_construct(type=_json_type(type(options[0])), enum=options)
+
+    return ItemType.model_construct(type=_json_type(annotation), format=_json_format(annotation))
+
+
+def _json_type(annotation: Any) -> PropertyType:
+    if annotation is bool:
+        return "boolean"
+    if annotation is int:
+        return "integer"
+    if annotation is float:
+        return "number"
+    if annotation in (str, SecretStr, Color, date, time, datetime):
+        return "string"
+
+    raise TypeError(f"Unsupported field type: {annotation}")
+
+
+def _json_format(annotation: Any) -> PropertyFormat | None:
+    if annotation is SecretStr:
+        return "password"
+    if annotation is Color:
+        return "color"
+    if annotation is datetime:
+        return "date-time"
+    if annotation is date:
+        return "date"
+    if annotation is time:
+        return "time"
+
+    return None
+
+
+def _constraints(field: FieldInfo) -> dict[str, Any]:
+    constraints = {}
+
+    for m in field.metadata:
+        for name in ("ge", "gt", "le", "lt", "multiple_of", "min_length", "max_length", "pattern"):
+            if getattr(m, name, None) is not None:
+                constraints[name] = getattr(m, name)
+
+    return constraints
+
+
+def _optional(annotation: Any) -> Any:
+    if get_origin(annotation) not in (Union, UnionType):
+        return None
+
+    args = [a for a in get_args(annotation) if a is not NoneType]
+
+    return args[0] if len(args) == 1 and len(args) < len(get_args(annotation)) else None
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
@@ -0,0 +1,154 @@
+from pydantic import BaseModel
+
+from src.backends import ui
+from src.plan import PlanEngine, RenderPlan, get_plan
+from src.state import ElementStore, state_size
+
+FORMS_KEY = "__pydantic_forms"
+
+
+def register_form(form_key: str) -> None:
+    """Records the form key in the session, so the namespace of a form whose key starts with
+    another form key, e.g. "user_profile" and "user", is not taken for the namespace of the other
+    form.
+
+    :param form_key: Form key
+    :type form_key: str
+    """
+
+    forms = ui.session_state.get(FORMS_KEY)
+
+    if forms is None:
+        ui.session_state[FORMS_KEY] = forms = set()
+
+    forms.add(form_key)
+
+
+def form_state_keys(model_class: type[BaseModel], engine: PlanEngine = "json_schema") -> list[str]:
+    """Returns the session state keys of the form: keys of the form itself, which start with the
+    form key and "__", and the field keys recorded on the last run of the form. Other keys that
+    start with the form key, such as keys of the app or of another form with a longer form key, are
+    excluded.
+
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :return: Session state keys
+    :rtype: list[str]
+    """
+
+    form_key = get_plan(model_class, engine).form_key
+    owned = ui.session_state.get(f"{form_key}__keys", set())
+
+    return [k for k in _namespace_keys(form_key) if k in owned or k.startswith(f"{form_key}__")]
+
+
+def clear_form_state(model_class: type[BaseModel], engine: PlanEngine = "json_schema") -> None:
+    """Removes all session state of the form, e.g. when the user leaves the page of the form.
+
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    """
+
+    for key in form_state_keys(model_class, engine):
+        del ui.session_state[key]
+
+
+def form_state_size(model_class: type[BaseModel], engine: PlanEngine = "json_schema") -> int:
+    """Returns the approximate memory of the session state of the form.
+
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :return: Size in bytes
+    :rtype: int
+    """
+
+    return sum(state_size(ui.session_state[k]) for k in form_state_keys(model_class, engine))
+
+
+def collect_orphans(plan: RenderPlan) -> int:
+    """Removes the field keys recorded on the previous run of the form that belong to no field of
+    the plan anymore, such as keys of removed fields or of list and dict items that no longer
+    exist. The field keys of this run are recorded, keys the form never used are not touched.
+
+    :param plan: Render plan of the form
+    :type plan: RenderPlan
+    :return: Number of removed keys
+    :rtype: int
+    """
+
+    owned_key = f"{plan.form_key}__keys"
+    owned = ui.session_state.get(owned_key, set())
+    form_prefix = f"{plan.form_key}__"
+    items, live, orphans = {}, set(), []
+
+    for k in _namespace_keys(plan.form_key):
+        if k.startswith(form_prefix):
+            continue
+        if _is_live(plan, k, items):
+            live.add(k)
+        elif k in owned:
+            orphans.append(k)
+
+    for key in orphans:
+        del ui.session_state[key]
+
+    ui.session_state[owned_key] = live
+
+    return len(orphans)
+
+
+def _namespace_keys(form_key: str) -> list[str]:
+    prefix = f"{form_key}_"
+    others = [
+        f"{k}_"
+        for k in ui.session_state.get(FORMS_KEY, ())
+        if k != form_key and k.startswith(prefix)
+    ]
+
+    return [
+        k
+        for k in ui.session_state.keys()
+        if isinstance(k, str)
+        and (k == form_key or k.startswith(prefix))
+        and not any(k == o[:-1] or k.startswith(o) for o in others)
+    ]
+
+
+def _is_live(plan: RenderPlan, key: str, items: dict[str, set[int] | None]) -> bool:
+    if key in plan.keys or key.startswith(f"{plan.form_key}__"):
+        return True
+
+    end = len(key)
+
+    while end > 0:
+        f = plan.keys.get(key[:end])
+
+        if f is None:
+            end = key.rfind("_", 0, end)
+            continue
+
+        rest = key[end:]
+
+        if rest == "" or rest.startswith("__") or f.kind in ("union", "recursive"):
+            return True
+        if f.kind == "nested":
+            return False
+
+        if f.key not in items:
+            store = ui.session_state.get(f.key)
+            items[f.key] = set(store.order) if isinstance(store, ElementStore) else None
+
+        if items[f.key] is None:
+            return True
+
+        index = rest[1:].split("_", 1)[0]
+
+        return index.isdigit() and int(index) in items[f.key]
+
+    return False
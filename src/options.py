@@ -0,0 +1,34 @@
+from typing import Any, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from pydantic import BaseModel
+
+
+class RenderOptions(BaseModel):
+    array_page_size: int | None = None
+    tabular: bool = False
+    batched: bool = False
+    fragments: bool = False
+    observer: Any | None = None
+    choice_page_size: int | None = None
+    compact: bool = False
+    reorderable: bool = False
+    show_help: bool = True
+
+
+_options: ContextVar[RenderOptions] = ContextVar("options", default=RenderOptions())
+
+
+@contextmanager
+def use_options(options: RenderOptions) -> Iterator[RenderOptions]:
+    token = _options.set(options)
+
+    try:
+        yield options
+    finally:
+        _options.reset(token)
+
+
+def get_options() -> RenderOptions:
+    return _options.get()
@@ -0,0 +1,73 @@
+from typing import Any
+from enum import Enum
+
+from pydantic import BaseModel, SecretBytes, SecretStr
+
+from src.backends import ui
+from src.plan import FieldPlan, PlanEngine, get_plan
+
+
+def diff_values(
+    fields: list[FieldPlan], old: dict[str, Any] | None, new: dict[str, Any]
+) -> dict[str, Any]:
+    """Returns the fields whose values changed, nested models contain only their changed fields.
+    Original values are compared in the form the inputs return them: Enum members as their values,
+    tuples and sets as lists and secrets as their masked text, so an untouched secret is never
+    patched.
+
+    :param fields: Field plans of the model
+    :type fields: list[FieldPlan]
+    :param old: Original values
+    :type old: dict[str, Any] | None
+    :param new: Current values
+    :type new: dict[str, Any]
+    :return: Patch of the changed values
+    :rtype: dict[str, Any]
+    """
+
+    old = old or {}
+    patch = {}
+
+    for f in fields:
+        if f.name not in new:
+            continue
+
+        value, previous = new[f.name], old.get(f.name)
+
+        if f.kind == "nested" and isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_values(f.fields, previous, value)
+
+            if len(nested) > 0:
+                patch[f.name] = nested
+
+        elif _comparable(value) != _comparable(previous):
+            patch[f.name] = value
+
+    return patch
+
+
+def _comparable(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (SecretStr, SecretBytes)):
+        return str(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_comparable(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _comparable(v) for k, v in value.items()}
+
+    return value
+
+
+def form_patch(model_class: type[BaseModel], engine: PlanEngine = "json_schema") -> dict[str, Any]:
+    """Returns the patch of the last form submitted with diff=True.
+
+    :param model_class: Pydantic model class of the form
+    :type model_class: type[BaseModel]
+    :param engine: Plan engine the form is rendered with, defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :return: Changed values, nested models contain only their changed fields
+    :rtype: dict[str, Any]
+    """
+
+    return ui.session_state.get(f"{get_plan(model_class, engine).form_key}__patch", {})
@@ -0,0 +1,268 @@
+from typing import Any, Callable, Literal
+from collections import OrderedDict
+from functools import partial
+from threading import Lock
+
+from pydantic import BaseModel
+
+from src.schemas import Schema, Property, NestedProperty, UnionProperty
+from src.utils import label_to_key, key_to_label
+from src.inputs import resolve_input
+from src.introspect import model_reference, model_schema
+
+FieldKind = Literal["input", "nested", "recursive", "union"]
+PlanEngine = Literal["json_schema", "model"]
+
+
+class FieldPlan(BaseModel):
+    name: str
+    path: tuple[str, ...]
+    key: str
+    label: str
+    kind: FieldKind
+    property: Property | None = None
+    input_fnc: Callable | None = None
+    default: Any | None = None
+    nullable: bool = False
+    fields: list["FieldPlan"] = []
+    expand_fnc: Callable | None = None
+    discriminator: str | None = None
+    variants: dict[str, "FieldPlan"] = {}
+
+
+class RenderPlan(BaseModel):
+    title: str
+    form_key: str
+    fields: list[FieldPlan]
+    paths: dict[tuple[str, ...], FieldKind]
+    keys: dict[str, FieldPlan] = {}
+
+
+class PlanCacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class PlanCache:
+    """Thread-safe LRU cache of render plans keyed by model class, shared by all sessions."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._plans: OrderedDict[tuple[type[BaseModel], PlanEngine], RenderPlan] = OrderedDict()
+        self._lock = Lock()
+
+    def get(
+        self,
+        model_class: type[BaseModel],
+        engine: PlanEngine,
+        builder: Callable[[type[BaseModel], PlanEngine], RenderPlan],
+    ) -> RenderPlan:
+        cache_key = (model_class, engine)
+
+        with self._lock:
+            if cache_key in self._plans:
+                self.hits += 1
+                self._plans.move_to_end(cache_key)
+                return self._plans[cache_key]
+
+            self.misses += 1
+
+        plan = builder(model_class, engine)
+
+        with self._lock:
+            self._plans[cache_key] = plan
+            self._plans.move_to_end(cache_key)
+
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+        return plan
+
+    def invalidate(self, model_class: type[BaseModel] | None = None) -> None:
+        with self._lock:
+            if model_class is None:
+                self._plans.clear()
+            else:
+                for cache_key in [k for k in self._plans if k[0] is model_class]:
+                    del self._plans[cache_key]
+
+    def stats(self) -> PlanCacheStats:
+        with self._lock:
+            return PlanCacheStats(
+                hits=self.hits, misses=self.misses, size=len(self._plans), maxsize=self.maxsize
+            )
+
+
+plan_cache = PlanCache()
+_expand_lock = Lock()
+
+
+def get_plan(model_class: type[BaseModel], engine: PlanEngine = "json_schema") -> RenderPlan:
+    """Returns the compiled render plan of the model class, builds it on the first call.
+
+    :param model_class: Pydantic model class
+    :type model_class: type[BaseModel]
+    :param engine: Schema source, "json_schema" or "model" (reads model fields directly), defaults to "json_schema"
+    :type engine: PlanEngine, optional
+    :return: Render plan
+    :rtype: RenderPlan
+    """
+
+    return plan_cache.get(model_class, engine, build_plan)
+
+
+def invalidate_plans(model_class: type[BaseModel] | None = None) -> None:
+    """Removes the cached render plan of the model class, or all cached plans if no class is given.
+
+    :param model_class: Pydantic model class, defaults to None
+    :type model_class: type[BaseModel] | None, optional
+    """
+
+    plan_cache.invalidate(model_class)
+
+
+def expand_field(f: FieldPlan) -> list[FieldPlan]:
+    """Returns the fields of the nested model, a recursive model is expanded by one level on the first call.
+    Plans are shared by all sessions, so the expansion is guarded by a lock and each level is built
+    only once.
+
+    :param f: Plan of the nested field
+    :type f: FieldPlan
+    :return: Plans of the nested fields
+    :rtype: list[FieldPlan]
+    """
+
+    if f.expand_fnc is not None:
+        with _expand_lock:
+            if f.expand_fnc is not None:
+                f.fields = f.expand_fnc()
+                f.expand_fnc = None
+
+    return f.fields
+
+
+def build_plan(model_class: type[BaseModel], engine: PlanEngine = "json_schema") -> RenderPlan:
+    if engine == "model":
+        schema = model_schema(model_class)
+        stack = (model_reference(model_class),)
+    else:
+        schema, stack = _root_schema(model_class.model_json_schema(ref_template="{model}"))
+
+    plan = RenderPlan(
+        title=schema.title, form_key=label_to_key(schema.title), fields=[], paths={}
+    )
+    plan.fields = _build_fields(
+        schema, schema.definitions or {}, plan.form_key, (), plan.paths, stack
+    )
+    plan.keys = _index_keys(plan.fields, {})
+
+    return plan
+
+
+def _index_keys(fields: list[FieldPlan], keys: dict[str, FieldPlan]) -> dict[str, FieldPlan]:
+    for f in fields:
+        keys[f.key] = f
+
+        if f.kind == "nested":
+            _index_keys(f.fields, keys)
+
+    return keys
+
+
+def _root_schema(json_schema: dict[str, Any]) -> tuple[Schema, tuple[str, ...]]:
+    if "properties" in json_schema:
+        return Schema(**json_schema), ()
+
+    reference = NestedProperty(**json_schema).reference
+    definitions = json_schema["$defs"]
+
+    return Schema(**{**definitions[reference], "$defs": definitions}), (reference,)
+
+
+def _build_fields(
+    schema: Schema,
+    definitions: dict[str, Schema],
+    key: str,
+    path: tuple[str, ...],
+    paths: dict[tuple[str, ...], FieldKind],
+    stack: tuple[str, ...] = (),
+) -> list[FieldPlan]:
+    return [
+        _build_field(prop_key, p, definitions, key, path, paths, stack)
+        for prop_key, p in schema.properties.items()
+    ]
+
+
+def _build_field(
+    name: str,
+    p: Property | NestedProperty | UnionProperty,
+    definitions: dict[str, Schema],
+    key: str,
+    path: tuple[str, ...],
+    paths: dict[tuple[str, ...], FieldKind],
+    stack: tuple[str, ...],
+) -> FieldPlan:
+    if isinstance(p, Property):
+        paths[(*path, name)] = "input"
+
+        return FieldPlan(
+            name=name,
+            path=(*path, name),
+            key=f"{key}_{name}",
+            label=p.title,
+            kind="input",
+            property=p,
+            input_fnc=resolve_input(p, definitions),
+            default=p.default,
+        )
+
+    paths[(*path, name)] = "nested"
+
+    if isinstance(p, NestedProperty):
+        recursive = p.reference in stack
+        expand_fnc = partial(
+            _build_fields,
+            definitions[p.reference],
+            definitions,
+            f"{key}_{name}",
+            (*path, name),
+            paths,
+            (p.reference,) if recursive else (*stack, p.reference),
+        )
+
+        return FieldPlan(
+            name=name,
+            path=(*path, name),
+            key=f"{key}_{name}",
+            label=key_to_label(name),
+            kind="recursive" if recursive else "nested",
+            default=p.default,
+            nullable=p.nullable,
+            fields=[] if recursive else expand_fnc(),
+            expand_fnc=expand_fnc if recursive else None,
+        )
+
+    variants = {
+        tag: _build_field(tag, v, definitions, f"{key}_{name}", (*path, name), paths, stack)
+        for tag, v in p.variants.items()
+    }
+
+    if p.discriminator is not None:
+        for v in variants.values():
+            v.fields = [f for f in v.fields if f.name != p.discriminator]
+
+    return FieldPlan(
+        name=name,
+        path=(*path, name),
+        key=f"{key}_{name}",
+        label=p.title,
+        kind="union",
+        default=p.default,
+        nullable=p.nullable,
+        discriminator=p.discriminator,
+        variants=variants,
+    )
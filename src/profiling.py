@@ -0,0 +1,148 @@
+from typing import Iterator, Literal, Protocol
+from contextlib import contextmanager
+from time import perf_counter
+
+from pydantic import BaseModel
+
+from src.backends import ui
+from src.options import get_options
+
+SpanKind = Literal["form", "plan", "field", "nested", "validation"]
+
+
+class Span(BaseModel):
+    kind: SpanKind
+    path: tuple[str, ...] = ()
+    duration_ms: float
+    widgets: int
+    deltas: int = 0
+    delta_bytes: int = 0
+
+
+class FormObserver(Protocol):
+    def on_span(self, span: Span) -> None: ...
+
+
+class SpanStats(BaseModel):
+    kind: SpanKind
+    path: tuple[str, ...]
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    widgets: int = 0
+    delta_bytes: int = 0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls > 0 else 0.0
+
+
+class RenderProfiler:
+    """Aggregates the spans of a form across reruns."""
+
+    def __init__(self, key: str = "render_profiler") -> None:
+        self.key = key
+        self.stats: dict[tuple[SpanKind, tuple[str, ...]], SpanStats] = {}
+
+    def on_span(self, span: Span) -> None:
+        stats = self.stats.get((span.kind, span.path))
+
+        if stats is None:
+            stats = self.stats[(span.kind, span.path)] = SpanStats(kind=span.kind, path=span.path)
+
+        stats.calls += 1
+        stats.total_ms += span.duration_ms
+        stats.max_ms = max(stats.max_ms, span.duration_ms)
+        stats.widgets = span.widgets
+        stats.delta_bytes = span.delta_bytes
+
+    def reset(self) -> None:
+        self.stats = {}
+
+    def slowest(self, n: int | None = None) -> list[SpanStats]:
+        """Returns the aggregated spans ordered by their mean duration.
+
+        :param n: Maximum number of spans, defaults to None
+        :type n: int | None, optional
+        :return: Aggregated spans, slowest first
+        :rtype: list[SpanStats]
+        """
+
+        return sorted(self.stats.values(), key=lambda s: s.mean_ms, reverse=True)[:n]
+
+    def show(self, label: str = "Show slowest fields") -> None:
+        """Shows a toggle in the sidebar, when it is on the slowest spans are shown in a sortable table.
+
+        :param label: Toggle label, defaults to "Show slowest fields"
+        :type label: str, optional
+        """
+
+        import pandas as pd
+
+        with ui.sidebar:
+            if not ui.toggle(label, key=f"{self.key}__show"):
+                return
+
+            ui.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "kind": s.kind,
+                            "path": ".".join(map(str, s.path)),
+                            "calls": s.calls,
+                            "mean ms": round(s.mean_ms, 3),
+                            "max ms": round(s.max_ms, 3),
+                            "widgets": s.widgets,
+                            "delta kB": round(s.delta_bytes / 1024, 1),
+                        }
+                        for s in self.slowest()
+                    ]
+                ),
+                hide_index=True,
+            )
+
+            if ui.button("Reset profile", key=f"{self.key}__reset"):
+                self.reset()
+
+
+def session_profiler(key: str = "render_profiler") -> RenderProfiler:
+    """Returns the profiler of the current session, creates it on the first call.
+
+    :param key: Session state key of the profiler, defaults to "render_profiler"
+    :type key: str, optional
+    :return: Render profiler
+    :rtype: RenderProfiler
+    """
+
+    if key not in ui.session_state:
+        ui.session_state[key] = RenderProfiler(key)
+
+    return ui.session_state[key]
+
+
+@contextmanager
+def span(kind: SpanKind, path: tuple[str, ...] = ()) -> Iterator[None]:
+    observer = get_options().observer
+
+    if observer is None:
+        yield
+        return
+
+    widgets = getattr(ui, "widget_count", 0)
+    deltas = getattr(ui, "delta_count", 0)
+    delta_bytes = getattr(ui, "delta_bytes", 0)
+    start = perf_counter()
+
+    try:
+        yield
+    finally:
+        observer.on_span(
+            Span(
+                kind=kind,
+                path=path,
+                duration_ms=(perf_counter() - start) * 1000,
+                widgets=getattr(ui, "widget_count", 0) - widgets,
+                deltas=getattr(ui, "delta_count", 0) - deltas,
+                delta_bytes=getattr(ui, "delta_bytes", 0) - delta_bytes,
+            )
+        )
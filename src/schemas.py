@@ -1,14 +1,25 @@
 from typing import Any, Annotated, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 PropertyType = Literal["string", "integer", "number", "array", "object", "boolean"]
 PropertyFormat = Literal["color", "date", "time", "date-time", "password"]
 
+VARIANT_TAGS = {
+    "integer": "int",
+    "number": "float",
+    "string": "str",
+    "boolean": "bool",
+    "date": "date",
+    "time": "time",
+    "date-time": "datetime",
+}
+
 
 class ItemType(BaseModel):
-    type: PropertyType
+    type: PropertyType | None = None
     enum: list[Any] | None = None
     format: PropertyFormat | None = None
+    reference: Annotated[str | None, Field(alias="$ref")] = None
 
 
 class Property(BaseModel):
@@ -33,14 +44,83 @@ class Property(BaseModel):
     readOnly: bool = False
     additionalProperties: ItemType | None = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def _resolve_const(cls, data: Any) -> Any:
+        if not isinstance(data, dict) or "const" not in data or "type" in data:
+            return data
+
+        const = data["const"]
+        const_type = {bool: "boolean", int: "integer", float: "number"}.get(type(const), "string")
+
+        return {**data, "type": const_type, "enum": [const]}
+
 
 class NestedProperty(BaseModel):
     reference: Annotated[str, Field(alias="$ref")]
+    default: Any | None = None
+    nullable: bool = False
+
+    @model_validator(mode="before")
+    @classmethod
+    def _resolve_composition(cls, data: Any) -> Any:
+        if not isinstance(data, dict) or "$ref" in data:
+            return data
+
+        variants = data.get("anyOf") or data.get("allOf") or []
+        references = [v["$ref"] for v in variants if "$ref" in v]
+
+        if len(references) != 1:
+            return data
+
+        return {
+            "$ref": references[0],
+            "default": data.get("default"),
+            "nullable": any(v.get("type") == "null" for v in variants),
+        }
+
+
+class UnionProperty(BaseModel):
+    title: str
+    description: str | None = None
+    default: Any | None = None
+    variants: dict[str, Property | NestedProperty]
+    discriminator: str | None = None
+    nullable: bool = False
+
+    @model_validator(mode="before")
+    @classmethod
+    def _resolve_variants(cls, data: Any) -> Any:
+        if not isinstance(data, dict) or "variants" in data:
+            return data
+
+        options = data.get("oneOf") or data.get("anyOf")
+
+        if not options:
+            return data
+
+        discriminator = data.get("discriminator") or {}
+        tags = {v: k for k, v in discriminator.get("mapping", {}).items()}
+        variants = {}
+
+        for o in options:
+            if "$ref" in o:
+                variants[tags.get(o["$ref"], o["$ref"])] = o
+            elif o.get("type") not in (None, "null"):
+                tag = VARIANT_TAGS.get(o.get("format")) or VARIANT_TAGS[o["type"]]
+                variants[tag] = {"title": data.get("title", ""), **o}
+
+        return {
+            **data,
+            "variants": variants,
+            "discriminator": discriminator.get("propertyName"),
+            "nullable": any(o.get("type") == "null" for o in options),
+        }
 
 
 class Schema(BaseModel):
     title: str
-    properties: dict[str, Property | NestedProperty]
+    properties: dict[str, Property | NestedProperty | UnionProperty]
     required: list[str]
     definitions: Annotated[
         dict[str, "Schema"] | None,
@@ -51,4 +131,5 @@ class Schema(BaseModel):
 
 
 class InputError(BaseModel):
-    msg: str
+    msg: str | None = None
+    items: dict[int | str, str] = {}
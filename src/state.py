@@ -0,0 +1,97 @@
+from typing import Any
+import sys
+
+from pydantic import BaseModel
+
+from src.backends import ui
+
+
+class ElementStore(BaseModel):
+    """Keeps the elements of a list or dict input as plain values in slots, the slots of removed
+    elements are reused."""
+
+    seeds: list[Any] = []
+    values: list[Any] = []
+    order: list[int] = []
+    free: list[int] = []
+
+    def add(self, value: Any | None = None, position: int | None = None) -> int:
+        if len(self.free) > 0:
+            index = self.free.pop()
+            self.seeds[index] = value
+            self.values[index] = value
+        else:
+            index = len(self.seeds)
+            self.seeds.append(value)
+            self.values.append(value)
+
+        if position is None:
+            self.order.append(index)
+        else:
+            self.order.insert(position, index)
+
+        return index
+
+    def move(self, index: int, offset: int) -> None:
+        position = self.order.index(index)
+        target = min(max(position + offset, 0), len(self.order) - 1)
+        self.order.insert(target, self.order.pop(position))
+
+    def duplicate(self, index: int) -> int:
+        return self.add(self.values[index], self.order.index(index) + 1)
+
+    def remove(self, index: int) -> None:
+        self.order.remove(index)
+        self.seeds[index] = None
+        self.values[index] = None
+        self.free.append(index)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+
+def state_size(value: Any) -> int:
+    """Returns the approximate memory of the value and the objects it contains.
+
+    :param value: Session state value
+    :type value: Any
+    :return: Size in bytes
+    :rtype: int
+    """
+
+    seen, stack, size = set(), [value], 0
+
+    while len(stack) > 0:
+        v = stack.pop()
+
+        if id(v) in seen:
+            continue
+
+        seen.add(id(v))
+        size += sys.getsizeof(v)
+
+        if isinstance(v, dict):
+            stack.extend(v.keys())
+            stack.extend(v.values())
+        elif isinstance(v, (list, tuple, set, frozenset)):
+            stack.extend(v)
+        elif isinstance(v, BaseModel):
+            stack.append(v.__dict__)
+
+    return size
+
+
+def session_memory(prefix: str = "") -> int:
+    """Returns the approximate memory of the session state entries whose keys start with the prefix.
+
+    :param prefix: Key prefix, defaults to "" (whole session state)
+    :type prefix: str, optional
+    :return: Size in bytes
+    :rtype: int
+    """
+
+    return sum(
+        state_size(ui.session_state[k])
+        for k in list(ui.session_state.keys())
+        if str(k).startswith(prefix)
+    )
@@ -1,5 +1,18 @@
 from typing import Any
-from streamlit_extras.stylable_container import stylable_container
+import re
+
+CONTAINER_CLASS = "pydantic_form_container"
+
+CONTAINER_STYLES = f"""<style>
+div[data-testid="stVerticalBlock"]:has(> div.element-container > div.stMarkdown > div[data-testid="stMarkdownContainer"] > p > span.{CONTAINER_CLASS}) {{
+    border: 1px solid #48494d;
+    border-radius: 0.5rem;
+    padding: calc(1em - 1px)
+}}
+div[data-testid="stVerticalBlock"]:has(> div.element-container > div.stMarkdown > div[data-testid="stMarkdownContainer"] > p > span.{CONTAINER_CLASS}) > div:first-child {{
+    margin-bottom: -1rem;
+}}
+</style>"""
 
 
 def key_to_label(key: str) -> str:
@@ -10,14 +23,17 @@ def label_to_key(label: str) -> str:
     return "_".join([p.lower() for p in label.split(" ")])
 
 
+def container_styles() -> None:
+    import streamlit as st
+
+    st.markdown(CONTAINER_STYLES, unsafe_allow_html=True)
+
+
 def nested_container(key: str) -> Any:
-    return stylable_container(
-        key=key,
-        css_styles="""
-                {
-                    border: 1px solid #48494d;
-                    border-radius: 0.5rem;
-                    padding: calc(1em - 1px)
-                }
-                """,
-    )
+    import streamlit as st
+
+    name = re.sub(r"[^\w-]", "_", key)
+    container = st.container()
+    container.markdown(f'<span class="{CONTAINER_CLASS} {name}"></span>', unsafe_allow_html=True)
+
+    return container
@@ -0,0 +1,187 @@
+from typing import Any, Callable, Iterator
+from concurrent.futures import Executor, wait
+from inspect import isawaitable
+from time import monotonic
+import asyncio
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import PydanticCustomError
+
+from src.backends import ui
+from src.introspect import input_name
+
+
+class ValidationTimeout(TimeoutError):
+    pass
+
+
+def validate_model(model_class: type[BaseModel], values: dict[str, Any]) -> BaseModel:
+    """Creates the model instance, coroutines returned by async validators are awaited and their
+    results replace the field values.
+
+    :param model_class: Pydantic model class
+    :type model_class: type[BaseModel]
+    :param values: Field values
+    :type values: dict[str, Any]
+    :raises ValidationError: If the values or an async validator are not valid
+    :return: Pydantic model instance
+    :rtype: BaseModel
+    """
+
+    instance = model_class(**values)
+    pending = list(_pending(instance, ()))
+
+    if len(pending) > 0:
+        asyncio.run(_resolve(model_class, pending))
+
+    return instance
+
+
+def validate_update(instance: BaseModel, update: dict[str, Any]) -> BaseModel:
+    """Validates the instance with the changed fields replaced, the whole update is applied before
+    the model validators run once. The unchanged values are passed as they are, so nested models
+    without a change are not validated again. Coroutines returned by async validators are awaited.
+
+    :param instance: Pydantic model instance
+    :type instance: BaseModel
+    :param update: New values of the changed fields
+    :type update: dict[str, Any]
+    :raises ValidationError: If the updated values are not valid
+    :return: Updated copy of the instance
+    :rtype: BaseModel
+    """
+
+    model_class = instance.__class__
+    values = {
+        input_name(name, field): getattr(instance, name)
+        for name, field in model_class.model_fields.items()
+    }
+    res = model_class.model_validate({**values, **update})
+    pending = list(_pending(res, ()))
+
+    if len(pending) > 0:
+        asyncio.run(_resolve(model_class, pending))
+
+    return res
+
+
+def run_validation(
+    executor: Executor,
+    model_class: type[BaseModel],
+    values: dict[str, Any],
+    key: str,
+    timeout: float | None = None,
+    poll_interval: float = 0.1,
+    instance: BaseModel | None = None,
+) -> BaseModel:
+    """Validates the values in the executor while a spinner is shown. A pending validation stored
+    under the key is cancelled first, so a resubmitted form does not wait for the previous one.
+    Validation errors are returned by the worker as error details, as ValidationError cannot be
+    pickled, and raised again here.
+
+    :param executor: Thread or process pool executor
+    :type executor: Executor
+    :param model_class: Pydantic model class
+    :type model_class: type[BaseModel]
+    :param values: Field values
+    :type values: dict[str, Any]
+    :param key: Session state key of the pending validation
+    :type key: str
+    :param timeout: Seconds to wait for the validation, defaults to None
+    :type timeout: float | None, optional
+    :param poll_interval: Seconds between checks of the validation, defaults to 0.1
+    :type poll_interval: float, optional
+    :param instance: If set, the values are an update of the changed fields of this instance,
+        defaults to None
+    :type instance: BaseModel | None, optional
+    :raises ValidationError: If the values are not valid
+    :raises ValidationTimeout: If the validation does not finish in time
+    :return: Pydantic model instance
+    :rtype: BaseModel
+    """
+
+    previous = ui.session_state.get(key)
+
+    if previous is not None:
+        previous.cancel()
+
+    if instance is not None:
+        future = executor.submit(_validate_in_worker, validate_update, instance, values)
+    else:
+        future = executor.submit(_validate_in_worker, validate_model, model_class, values)
+    ui.session_state[key] = future
+    start = monotonic()
+    slot = ui.empty()
+
+    with ui.spinner("Validating"):
+        while len(wait([future], timeout=poll_interval).done) == 0:
+            elapsed = monotonic() - start
+
+            if timeout is not None and elapsed >= timeout:
+                future.cancel()
+                del ui.session_state[key]
+                slot.empty()
+                raise ValidationTimeout(f"Validation did not finish in {timeout:g} s")
+
+            slot.text(f"Validating for {elapsed:.1f} s")
+
+    del ui.session_state[key]
+    slot.empty()
+    res = future.result()
+
+    if isinstance(res, tuple):
+        raise _validation_error(*res)
+
+    return res
+
+
+def _validate_in_worker(
+    fnc: Callable[..., BaseModel], *args: Any
+) -> BaseModel | tuple[str, list[dict[str, Any]]]:
+    try:
+        return fnc(*args)
+    except ValidationError as errs:
+        return errs.title, [
+            {"type": e["type"], "loc": e["loc"], "msg": e["msg"], "input": e["input"]}
+            for e in errs.errors(include_url=False)
+        ]
+
+
+def _validation_error(title: str, errors: list[dict[str, Any]]) -> ValidationError:
+    return ValidationError.from_exception_data(
+        title,
+        [
+            {"type": PydanticCustomError(e["type"], e["msg"]), "loc": e["loc"], "input": e["input"]}
+            for e in errors
+        ],
+    )
+
+
+def _pending(
+    instance: BaseModel, loc: tuple[str, ...]
+) -> Iterator[tuple[BaseModel, str, tuple[str, ...], Any]]:
+    for name in instance.model_fields:
+        value = getattr(instance, name)
+
+        if isawaitable(value):
+            yield instance, name, (*loc, name), value
+        elif isinstance(value, BaseModel):
+            yield from _pending(value, (*loc, name))
+
+
+async def _resolve(
+    model_class: type[BaseModel], pending: list[tuple[BaseModel, str, tuple[str, ...], Any]]
+) -> None:
+    results = await asyncio.gather(*(p[3] for p in pending), return_exceptions=True)
+    errors = []
+
+    for (instance, name, loc, _), res in zip(pending, results):
+        if isinstance(res, (ValueError, AssertionError)):
+            errors.append({"type": "value_error", "loc": loc, "input": None, "ctx": {"error": res}})
+        elif isinstance(res, BaseException):
+            raise res
+        else:
+            instance.__dict__[name] = res
+
+    if len(errors) > 0:
+        raise ValidationError.from_exception_data(model_class.__name__, errors)